@@ -0,0 +1,172 @@
+# -*- coding: utf-8 -*-
+"""
+Micro-benchmark del extractor de fichas de Fontur sobre páginas guardadas.
+- "antes": la extracción de v4.4 (un select/select_one por selector, también para la fecha)
+- "después": deptosF.extract_detail (las etiquetas se ubican en una sola pasada, scan_detail)
+- Verifica que ambos devuelvan los mismos campos en cada página
+- Tiempos por tamaño de página; la conclusión sale de las proporciones medidas
+
+Uso rápido:
+  python bench_detalle.py                       # páginas de ejemplo (fixtures/*.html)
+  python bench_detalle.py .fontur_cache/ otra.html --repeat 20
+"""
+
+import os
+import re
+import glob
+import json
+import time
+import argparse
+
+from deptosF import (PHONE_RE, BODY_SEL, HERO_SEL, SCOPE_SEL, DATE_TEXT_SEL, clean_text, absolutize,
+                     domain_of, extract_detail, parse_iso_like, parse_spanish_textual, parse_ddmmyyyy,
+                     parse_yyyymmdd)
+from comun.parseo_html import make_soup
+
+FIELDS = ["imagen", "telefono", "precio", "detalles", "_pub_dt"]
+# Páginas guardadas que vienen con el repositorio (fichas cortas y largas, y dos listados)
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+SMALL_KB = 20  # límite entre páginas "cortas" y "largas" en el reporte
+SAME_RATIO = 0.05  # diferencias menores al 5 % se reportan como empate
+
+def extract_pub_date_v44(soup):
+    """Fecha de publicación de v4.4: un select_one por selector (referencia)."""
+    for sel in [
+        "meta[property='article:published_time']",
+        "meta[property='og:published_time']",
+        "meta[name='article:published_time']",
+        "meta[name='dcterms.date']",
+        "meta[name='DC.date.issued']",
+        "meta[property='og:updated_time']",
+    ]:
+        el = soup.select_one(sel)
+        if el and el.get("content"):
+            dt = parse_iso_like(el.get("content"))
+            if dt:
+                return dt
+
+    t = soup.select_one("time[datetime]")
+    if t and t.get("datetime"):
+        dt = parse_iso_like(t.get("datetime"))
+        if dt:
+            return dt
+    t2 = soup.select_one("time")
+    if t2 and t2.get_text():
+        dt = parse_spanish_textual(t2.get_text())
+        if dt:
+            return dt
+
+    main = soup.select_one(DATE_TEXT_SEL)
+    text = main.get_text(" ", strip=True) if main else soup.get_text(" ", strip=True)
+
+    for parser in (parse_spanish_textual, parse_ddmmyyyy, parse_yyyymmdd):
+        dt = parser(text)
+        if dt:
+            return dt
+    return None
+
+def extract_detail_v44(html, url):
+    """Extracción original de _fetch_detail (referencia para medir y comparar)."""
+    soup = make_soup(html)
+    body_el = soup.select_one(BODY_SEL)
+    body_txt = clean_text(body_el.get_text(" ")) if body_el else None
+
+    imagen = None
+    hero = soup.select_one(HERO_SEL)
+    if hero and hero.get("src"):
+        imagen = absolutize(domain_of(url) or "https://www.fontur.com.co", hero.get("src"))
+
+    tel = None
+    scopes = [el.get_text(" ") for el in soup.select(SCOPE_SEL)]
+    if not scopes:
+        scopes = [body_txt or ""]
+
+    for scope_text in scopes:
+        m = PHONE_RE.search(scope_text)
+        if m:
+            tel = clean_text(m.group(0))
+            break
+
+    precio = None
+    for scope_text in scopes:
+        if re.search(r'(?i)\bprecio[s]?\b', scope_text):
+            sent = re.search(r'([^.]*\bprecio[^.]*\.)', scope_text, flags=re.I)
+            if sent:
+                precio = clean_text(sent.group(1))
+                break
+
+    return {"imagen": imagen, "telefono": tel, "precio": precio, "detalles": body_txt,
+            "_pub_dt": extract_pub_date_v44(soup)}
+
+def load_pages(paths):
+    files = []
+    for p in paths:
+        if os.path.isdir(p):
+            files.extend(sorted(glob.glob(os.path.join(p, "*.html"))))
+        else:
+            files.extend(sorted(glob.glob(p)))
+    pages = []
+    for path in files:
+        with open(path, "r", encoding="utf-8", errors="replace") as f:
+            html = f.read()
+        # Las páginas del caché traen la URL original en el .json vecino
+        url = "https://www.fontur.com.co/"
+        meta = os.path.splitext(path)[0] + ".json"
+        if os.path.exists(meta):
+            with open(meta, "r", encoding="utf-8") as f:
+                url = json.load(f).get("url") or url
+        pages.append((path, url, html))
+    return pages
+
+def time_per_page(fn, pages, repeat):
+    best = None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        for _, url, html in pages:
+            fn(html, url)
+        elapsed = time.perf_counter() - t0
+        best = elapsed if best is None else min(best, elapsed)
+    return best / len(pages) * 1000
+
+def verdict(ratio):
+    if ratio >= 1 + SAME_RATIO:
+        return f"más rápida (x{ratio:.2f})"
+    if ratio <= 1 - SAME_RATIO:
+        return f"más lenta (x{ratio:.2f})"
+    return f"sin diferencia apreciable (x{ratio:.2f})"
+
+def main():
+    ap = argparse.ArgumentParser(description="Compara el extractor de fichas v4.4 con el actual.")
+    ap.add_argument("paths", nargs="*", default=[FIXTURES], help="Archivos .html o carpetas con páginas guardadas.")
+    ap.add_argument("--repeat", type=int, default=5, help="Repeticiones (se reporta la mejor).")
+    args = ap.parse_args()
+
+    pages = load_pages(args.paths)
+    if not pages:
+        raise SystemExit("No se encontraron páginas .html (indique una carpeta, p. ej. .fontur_cache/).")
+
+    diffs = 0
+    for path, url, html in pages:
+        a, b = extract_detail_v44(html, url), extract_detail(html, url)
+        bad = [k for k in FIELDS if a.get(k) != b.get(k)]
+        if bad:
+            diffs += 1
+            print(f"[DIF] {path}: {', '.join(bad)}")
+
+    print(f"[OK] Páginas: {len(pages)} (con diferencias: {diffs})")
+    grupos = [("todas", pages),
+              (f"< {SMALL_KB} KB", [p for p in pages if len(p[2]) < SMALL_KB * 1024]),
+              (f">= {SMALL_KB} KB", [p for p in pages if len(p[2]) >= SMALL_KB * 1024])]
+    conclusion = []
+    for nombre, grupo in grupos:
+        if not grupo:
+            continue
+        antes = time_per_page(extract_detail_v44, grupo, args.repeat)
+        despues = time_per_page(extract_detail, grupo, args.repeat)
+        print(f"[OK] {nombre:9s} ({len(grupo):3d} págs.)  antes {antes:7.2f} ms/página  "
+              f"después {despues:7.2f} ms/página (x{antes / despues:.2f})")
+        conclusion.append(f"{nombre}: {verdict(antes / despues)}")
+    print("[--] Extractor actual frente a v4.4 — " + "; ".join(conclusion))
+
+if __name__ == "__main__":
+    main()
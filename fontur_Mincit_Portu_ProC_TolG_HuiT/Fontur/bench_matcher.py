@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark de generalF._match_interest sobre un corpus de textos de anclas.
+- "antes": normalizar cada variante y municipio en cada llamada (any + listas)
+- "después": InterestMatcher (una alternancia compilada por departamento)
+- Verifica que ambos coincidan en si el texto es de interés
+
+Corpus: textos de <a> de páginas guardadas (el caché de Fontur por defecto); si no hay
+páginas se arma uno sintético con títulos típicos de Fontur.
+
+Uso rápido:
+  python bench_matcher.py --depto Huila
+  python bench_matcher.py fichas/ --depto Caquetá --repeat 10
+"""
+
+import os
+import glob
+import time
+import random
+import argparse
+
+from generalF import FonturDeptScraper, InterestMatcher, slugify_text
+from comun.parseo_html import make_soup
+
+PLANTILLAS = [
+    "Noticias", "Proyectos", "Convocatorias", "Ver más", "Leer más", "Inicio", "Contáctenos",
+    "Fontur apoya el turismo en {lugar}", "Mejoramiento del malecón de {lugar}",
+    "Convocatoria para prestadores de servicios turísticos de {lugar}",
+    "Festival folclórico en {lugar}", "Infraestructura turística: {lugar}",
+    "Promoción de destinos de naturaleza", "Rendición de cuentas 2023",
+    "Capacitación en bilingüismo para guías", "Señalización turística nacional",
+]
+LUGARES = ["Neiva", "Pitalito", "San Agustín", "Ibagué", "Mocoa", "Florencia", "Cartagena",
+           "Santa Marta", "Medellín", "Bogotá", "Leticia", "Villavieja", "Desierto de la Tatacoa"]
+
+def old_match(keyword_variants, municipios, text):
+    """_match_interest original (referencia)."""
+    t = slugify_text(text or "")
+    if any(k in t for k in [slugify_text(v) for v in keyword_variants]): return True
+    if any(m in t for m in [slugify_text(v) for v in municipios]): return True
+    return False
+
+def load_corpus(paths, size):
+    texts = []
+    for p in paths:
+        files = sorted(glob.glob(os.path.join(p, "*.html"))) if os.path.isdir(p) else sorted(glob.glob(p))
+        for path in files:
+            with open(path, "r", encoding="utf-8", errors="replace") as f:
+                soup = make_soup(f.read())
+            texts.extend(a.get_text(" ", strip=True) for a in soup.select("a[href]"))
+    if texts:
+        return texts
+    rnd = random.Random(7)
+    return [rnd.choice(PLANTILLAS).format(lugar=rnd.choice(LUGARES)) for _ in range(size)]
+
+def best_time(fn, texts, repeat):
+    best = None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        for t in texts:
+            fn(t)
+        elapsed = time.perf_counter() - t0
+        best = elapsed if best is None else min(best, elapsed)
+    return best / len(texts) * 1e6
+
+def main():
+    ap = argparse.ArgumentParser(description="Compara el _match_interest original con InterestMatcher.")
+    ap.add_argument("paths", nargs="*", default=[".fontur_cache"], help="Archivos .html o carpetas (anclas del corpus).")
+    ap.add_argument("--depto", default="Huila", help="Departamento cuyas variantes/municipios se usan.")
+    ap.add_argument("--size", type=int, default=20000, help="Tamaño del corpus sintético (si no hay páginas).")
+    ap.add_argument("--repeat", type=int, default=5, help="Repeticiones (se reporta la mejor).")
+    args = ap.parse_args()
+
+    # _variants_for_depto no usa el navegador: se llama sin construir el scraper
+    variants, municipios = FonturDeptScraper._variants_for_depto(None, args.depto)
+    texts = load_corpus(args.paths, args.size)
+
+    t0 = time.perf_counter()
+    matcher = InterestMatcher(variants, municipios)
+    compile_ms = (time.perf_counter() - t0) * 1000
+
+    diffs = sum(1 for t in texts if old_match(variants, municipios, t) != bool(matcher.find(t)))
+    hits = sum(1 for t in texts if matcher.find(t))
+    antes = best_time(lambda t: old_match(variants, municipios, t), texts, args.repeat)
+    despues = best_time(matcher.find, texts, args.repeat)
+    print(f"[OK] Corpus: {len(texts)} anclas, {hits} de interés para {args.depto} (diferencias: {diffs})")
+    print(f"[OK] Compilación: {compile_ms:.2f} ms ({len(variants) + len(municipios)} términos)")
+    print(f"[OK] Antes:   {antes:.2f} µs/ancla")
+    print(f"[OK] Después: {despues:.2f} µs/ancla (x{antes / despues:.1f})")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark de motores HTML (comun/parseo_html.py) sobre páginas guardadas de Fontur.
+- Tiempo de parseo (make_soup) y de extracción completa por motor
+- Equivalencia campo a campo contra html.parser: fichas (extract_detail) y
+  listados (_find_result_links + _parse_link_item)
+- selectolax, si está instalado, se mide solo como referencia de parseo: su API de
+  nodos es distinta y los extractores no corren sobre él
+
+Uso rápido:
+  pip install lxml
+  python bench_parsers.py                       # páginas de ejemplo (fixtures/*.html)
+  python bench_parsers.py .fontur_cache/ --repeat 10
+"""
+
+import time
+import argparse
+
+from bench_detalle import FIXTURES, load_pages
+from deptosF import FonturDeptScraper, extract_detail
+from comun.parseo_html import PARSERS, DEFAULT_PARSER, available, make_soup, set_parser
+
+DETAIL_FIELDS = ["imagen", "telefono", "precio", "detalles", "_pub_dt"]
+LIST_FIELDS = ["titulo", "categoria", "descripcion", "enlace", "_list_dt"]
+
+def extract_all(scraper, html, url):
+    detail = extract_detail(html, url)
+    soup = make_soup(html)
+    items = [scraper._parse_link_item(a, list_url=url) for a in scraper._find_result_links(soup)]
+    return detail, [i for i in items if i]
+
+def best_time(fn, pages, repeat):
+    best = None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        for _, url, html in pages:
+            fn(html, url)
+        elapsed = time.perf_counter() - t0
+        best = elapsed if best is None else min(best, elapsed)
+    return best / len(pages) * 1000
+
+def diff_fields(ref, got):
+    (d_ref, l_ref), (d_got, l_got) = ref, got
+    bad = [k for k in DETAIL_FIELDS if d_ref.get(k) != d_got.get(k)]
+    if len(l_ref) != len(l_got):
+        bad.append(f"listado ({len(l_ref)} vs {len(l_got)} enlaces)")
+    else:
+        for a, b in zip(l_ref, l_got):
+            bad.extend(f"listado.{k}" for k in LIST_FIELDS if a.get(k) != b.get(k))
+    return sorted(set(bad))
+
+def main():
+    ap = argparse.ArgumentParser(description="Compara motores HTML en tiempo y en campos extraídos.")
+    ap.add_argument("paths", nargs="*", default=[FIXTURES], help="Archivos .html o carpetas con páginas guardadas.")
+    ap.add_argument("--repeat", type=int, default=5, help="Repeticiones (se reporta la mejor).")
+    args = ap.parse_args()
+
+    pages = load_pages(args.paths)
+    if not pages:
+        raise SystemExit("No se encontraron páginas .html (indique una carpeta, p. ej. .fontur_cache/).")
+
+    scraper = FonturDeptScraper("bench", workers=1)
+    try:
+        set_parser(DEFAULT_PARSER)
+        reference = {path: extract_all(scraper, html, url) for path, url, html in pages}
+        print(f"[OK] Páginas: {len(pages)}  (referencia: {DEFAULT_PARSER})")
+        for name in PARSERS:
+            if not available(name):
+                print(f"[--] {name}: no instalado")
+                continue
+            set_parser(name)
+            parse_ms = best_time(lambda html, url: make_soup(html), pages, args.repeat)
+            full_ms = best_time(lambda html, url: extract_all(scraper, html, url), pages, args.repeat)
+            diffs = {}
+            for path, url, html in pages:
+                bad = diff_fields(reference[path], extract_all(scraper, html, url))
+                if bad:
+                    diffs[path] = bad
+            print(f"[OK] {name:12s} parseo {parse_ms:7.2f} ms/pág  extracción {full_ms:7.2f} ms/pág  "
+                  f"páginas con diferencias: {len(diffs)}")
+            for path, bad in list(diffs.items())[:5]:
+                print(f"       [DIF] {path}: {', '.join(bad)}")
+    finally:
+        set_parser(DEFAULT_PARSER)
+        scraper.close()
+
+    try:
+        from selectolax.lexbor import LexborHTMLParser
+    except ImportError:
+        return
+    parse_ms = best_time(lambda html, url: LexborHTMLParser(html), pages, args.repeat)
+    print(f"[--] selectolax   parseo {parse_ms:7.2f} ms/pág  (solo referencia, sin extractores)")
+
+if __name__ == "__main__":
+    main()
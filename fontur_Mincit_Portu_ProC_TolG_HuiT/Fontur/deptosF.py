@@ -0,0 +1,1319 @@
+# -*- coding: utf-8 -*-
+"""
+FonturDeptScraper v4.5 (multi-departamento, filtro fecha >= 2019, salida formateada)
+- Motor común de huilaF.py, tolimaF.py, caquetaF.py y putumayoF.py (que quedan como atajos)
+- Busca resultados en Fontur por palabra clave/URL para uno o varios departamentos
+- Recorre paginación con ?page=N: lee el paginador de Drupal para conocer la última página y
+  descarga por adelantado las siguientes (--listing-ahead) mientras se enriquece la actual
+- Extrae campos del listado y enriquece desde la ficha.
+- Filtra resultados por fecha de publicación/actualización (>= min-year; por defecto 2019)
+- Descarga por HTTP con sesión keep-alive; Chrome solo como respaldo si la página depende de JS
+  (--backend selenium fuerza el navegador para todo; --block elige qué recursos no descarga)
+- Enriquece las fichas de cada página del listado en paralelo (--workers), con tope por host (--per-host)
+- Pre-filtro por fecha antes de descargar la ficha (--no-prefilter lo desactiva):
+  fecha del propio listado, Last-Modified y meta del <head> leído en streaming
+- Índice persistente nodo/URL -> fecha (--node-index, fontur_nodos.json) alimentado por cada ficha:
+  las URLs ya fechadas no se vuelven a descargar y, como los IDs de nodo crecen con el tiempo,
+  los nodos por debajo del corte estimado para --min-year se saltan (con muestreo de control)
+- Caché de páginas en disco (--cache-dir) con TTL y revalidación condicional (ETag/Last-Modified);
+  --offline re-ejecuta los parsers solo contra el caché, sin tocar el sitio
+- Modo incremental (--incremental): estado <out>_estado.json con huella por URL canónica;
+  corta la paginación en la primera página sin novedades, solo enriquece enlaces nuevos o
+  cambiados y escribe, además de la foto completa, <out>_<ts>_delta.json/.csv
+- Cada registro aceptado se anexa a <out>_parcial.jsonl con un checkpoint de página/visitados;
+  --resume retoma una corrida interrumpida y el JSON/CSV final se materializa desde el JSONL
+- En modo multi-departamento comparte sesión/navegador y pool y descarga cada ficha una sola vez.
+  Como la salida es fija (11 claves), cada registro conserva una sola 'ubicacion': la del
+  departamento en cuyo archivo aparece; los departamentos cuya búsqueda devolvió cada enlace
+  van aparte, en fontur_deptos_<ts>.json ([{"enlace", "departamentos"}])
+- Exporta SOLO estas 11 claves en este orden:
+  titulo, categoria, descripcion, enlace, imagen, ubicacion, tipo,
+  fecha_extraccion, precio, telefono, detalles
+  (un JSON/CSV por departamento, con el mismo prefijo que los scripts individuales)
+
+Uso rápido:
+  pip install requests selenium beautifulsoup4
+  python deptosF.py --deptos huila tolima caqueta putumayo --min-year 2019 --pages 20
+  python huilaF.py --min-year 2019 --pages 20          # un solo departamento
+"""
+
+import os
+import re
+import csv
+import json
+import hashlib
+import time
+import random
+import argparse
+import threading
+from datetime import datetime
+from email.utils import parsedate_to_datetime
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse, urljoin, urlencode, parse_qs
+
+from fontur_fetch import HybridFetcher, PageCache, BACKENDS, canonical_url
+import sys
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))  # comun/ está en la carpeta raíz
+from comun.bloqueo_recursos import PERFILES
+from comun.descarga import extract_last_page
+from comun.parseo_html import PARSERS, get_parser, make_soup, set_parser
+
+# -------------------------
+# Utilidades
+# -------------------------
+PHONE_RE = re.compile(r'(?:\+57\s?)?(?:\(?\d{1,3}\)?[\s\-.]?)?\d{3}[\s\-.]?\d{2,}|\+?\d[\d\s\-.]{6,}', re.UNICODE)
+
+SPANISH_MONTHS = {
+    "enero": 1, "febrero": 2, "marzo": 3, "abril": 4, "mayo": 5, "junio": 6,
+    "julio": 7, "agosto": 8, "septiembre": 9, "setiembre": 9, "octubre": 10,
+    "noviembre": 11, "diciembre": 12
+}
+
+def clean_text(s):
+    if not s:
+        return None
+    return re.sub(r'\s+', ' ', s).strip()
+
+def absolutize(base, href):
+    if not href:
+        return None
+    return urljoin(base, href)
+
+def domain_of(url):
+    try:
+        p = urlparse(url)
+        return f"{p.scheme}://{p.netloc}"
+    except Exception:
+        return None
+
+def pick_category(container_text):
+    if not container_text:
+        return None
+    hints = [
+        ("aventura", "aventura"),
+        ("gastronom", "gastronomía"),
+        ("cultura", "cultura"),
+        ("bienestar", "bienestar"),
+        ("natur", "naturaleza"),
+        ("evento", "evento"),
+        ("alojamiento", "alojamiento"),
+        ("transporte", "transporte"),
+        ("turismo", "turismo"),
+        ("promoci", "promoción"),
+        ("convocatoria", "convocatoria"),
+    ]
+    t = container_text.lower()
+    for key, label in hints:
+        if key in t:
+            return label
+    return None
+
+def jitter(a=0.6, b=1.2):
+    time.sleep(random.uniform(a, b))
+
+# ---- Parseo de fechas (formatos comunes en sitios Drupal)
+def parse_iso_like(s):
+    try:
+        s = s.strip()
+        if s.endswith("Z"):
+            s = s[:-1] + "+00:00"
+        if re.fullmatch(r"\d{4}-\d{2}-\d{2}", s):
+            return datetime.fromisoformat(s + "T00:00:00")
+        return datetime.fromisoformat(s)
+    except Exception:
+        return None
+
+def parse_spanish_textual(s):
+    # "12 de julio de 2021"
+    m = re.search(r'(\d{1,2})\s+de\s+([A-Za-záéíóúñÁÉÍÓÚÑ]+)\s+de\s+(\d{4})', s, flags=re.IGNORECASE)
+    if m:
+        d = int(m.group(1))
+        month_name = m.group(2).lower()
+        month_name = (month_name
+                      .replace("á","a").replace("é","e")
+                      .replace("í","i").replace("ó","o").replace("ú","u"))
+        month = SPANISH_MONTHS.get(month_name)
+        y = int(m.group(3))
+        if month:
+            try:
+                return datetime(y, month, d)
+            except Exception:
+                return None
+    return None
+
+def parse_ddmmyyyy(s):
+    m = re.search(r'\b(\d{1,2})[/-](\d{1,2})[/-](\d{4})\b', s)
+    if m:
+        d, mth, y = int(m.group(1)), int(m.group(2)), int(m.group(3))
+        try:
+            return datetime(y, mth, d)
+        except Exception:
+            return None
+    return None
+
+def parse_yyyymmdd(s):
+    m = re.search(r'\b(\d{4})[/-](\d{1,2})[/-](\d{1,2})\b', s)
+    if m:
+        y, mth, d = int(m.group(1)), int(m.group(2)), int(m.group(3))
+        try:
+            return datetime(y, mth, d)
+        except Exception:
+            return None
+    return None
+
+def parse_http_date(s):
+    # "Wed, 21 Oct 2015 07:28:00 GMT" (Last-Modified)
+    try:
+        return parsedate_to_datetime(s) if s else None
+    except Exception:
+        return None
+
+# Metas de fecha (atributo, valor) en orden de prioridad
+META_DATE_KEYS = [
+    ("property", "article:published_time"),
+    ("property", "og:published_time"),
+    ("name", "article:published_time"),
+    ("name", "dcterms.date"),
+    ("name", "DC.date.issued"),
+    ("property", "og:updated_time"),
+]
+
+def first_metas(soup):
+    """(atributo, valor) -> primera <meta> con ese property/name, como select_one por clave."""
+    metas = {}
+    for el in soup.find_all("meta"):
+        for attr in ("property", "name"):
+            value = el.get(attr)
+            if value is not None:
+                metas.setdefault((attr, value), el)
+    return metas
+
+def extract_meta_date(soup, metas=None):
+    """Fecha desde las meta del <head>; primer paso (y de mayor prioridad) de extract_pub_date."""
+    if metas is None:
+        metas = first_metas(soup)
+    for key in META_DATE_KEYS:
+        el = metas.get(key)
+        if el and el.get("content"):
+            dt = parse_iso_like(el.get("content"))
+            if dt:
+                return dt
+    return None
+
+def extract_pub_date(soup, found=None):
+    """
+    Intenta obtener fecha de publicación/actualización:
+    - meta[property='article:published_time'] / og:updated_time / dcterms
+    - <time datetime="..."> o <time>12 de julio de 2021</time>
+    - Texto libre: '12 de julio de 2021', '12/07/2021', '2021-07-12'
+      (found: resultado de scan_detail, para no volver a recorrer el árbol)
+    """
+    if found is None:
+        found = scan_detail(soup)
+    dt = extract_meta_date(soup, found["metas"])
+    if dt:
+        return dt
+
+    t = found["time_dt"]
+    if t and t.get("datetime"):
+        dt = parse_iso_like(t.get("datetime"))
+        if dt:
+            return dt
+    t2 = found["time"]
+    if t2 and t2.get_text():
+        dt = parse_spanish_textual(t2.get_text())
+        if dt:
+            return dt
+
+    main = found["date"]
+    text = main.get_text(" ", strip=True) if main else soup.get_text(" ", strip=True)
+
+    for parser in (parse_spanish_textual, parse_ddmmyyyy, parse_yyyymmdd):
+        dt = parser(text)
+        if dt:
+            return dt
+    return None
+
+NODE_ID_RE = re.compile(r"/node/(\d+)(?=[/?#]|$)")
+
+def extract_node_id(soup, url):
+    """ID de nodo de Drupal: de la URL, del shortlink/canonical o de data-history-node-id."""
+    m = NODE_ID_RE.search(url or "")
+    if not m and soup is not None:
+        for link in soup.select("link[rel='shortlink'][href], link[rel='canonical'][href]"):
+            m = NODE_ID_RE.search(link["href"])
+            if m:
+                break
+        if not m:
+            el = soup.select_one("[data-history-node-id]")
+            if el and el["data-history-node-id"].isdigit():
+                return int(el["data-history-node-id"])
+    return int(m.group(1)) if m else None
+
+def head_pub_date(head_html, headers=None):
+    """
+    Fecha a partir de una descarga parcial: meta del <head> (misma prioridad que
+    extract_pub_date, así que si existen el resultado final es idéntico) o, si no hay,
+    Last-Modified (la publicación nunca es posterior a la última modificación).
+    """
+    dt = extract_meta_date(make_soup(head_html))
+    if dt:
+        return dt
+    return parse_http_date((headers or {}).get("Last-Modified"))
+
+def extract_listing_date(container):
+    """
+    Fecha visible en el resultado de búsqueda (línea de información de Drupal, <time>).
+    Solo se miran elementos de metadatos, no el texto libre del resumen.
+    """
+    if container is None:
+        return None
+    t = container.select_one("time[datetime]")
+    if t:
+        dt = parse_iso_like(t.get("datetime"))
+        if dt:
+            return dt
+    for el in container.select(".search-result__info, .search-info, .submitted, .date, time, "
+                               ".field--name-created, .field--name-changed"):
+        txt = el.get_text(" ", strip=True)
+        for parser in (parse_spanish_textual, parse_ddmmyyyy, parse_yyyymmdd):
+            dt = parser(txt)
+            if dt:
+                return dt
+    return None
+
+# ---- Extracción de la ficha
+# Todos los selectores de la ficha son simples (.clase o etiqueta): en vez de un select/select_one
+# por selector (soupsieve recorre el árbol completo en cada uno) se clasifica cada etiqueta en una
+# sola pasada por find_all(True), en orden de documento, igual que select/select_one.
+BODY_SEL = ".node__content, .region-content, article, main, .layout-content"
+HERO_SEL = ".field--name-field-image img, .media img, figure img, img"
+SCOPE_SEL = ".field--name-field-telefono, .field--name-field-contacto, .contact, .field, .node__content, .region-content"
+DATE_TEXT_SEL = ".node__content, article, main, .region-content, .layout-content, body"
+# Los mismos selectores como (clases, etiquetas)
+BODY_MATCH = ({"node__content", "region-content", "layout-content"}, {"article", "main"})
+SCOPE_MATCH = ({"field--name-field-telefono", "field--name-field-contacto", "contact", "field",
+                "node__content", "region-content"}, set())
+DATE_TEXT_MATCH = ({"node__content", "region-content", "layout-content"}, {"article", "main", "body"})
+PRICE_WORD_RE = re.compile(r'\bprecio[s]?\b', re.I)
+PRICE_STEM_RE = re.compile(r'\bprecio', re.I)
+PRICE_SENT_RE = re.compile(r'([^.]*\bprecio[^.]*\.)', re.I)
+
+def _matches(tag, classes, spec):
+    cls, names = spec
+    return tag.name in names or not cls.isdisjoint(classes)
+
+def scan_detail(soup):
+    """
+    Una pasada por las etiquetas: cuerpo (BODY_SEL), ámbitos (SCOPE_SEL), texto para la fecha
+    (DATE_TEXT_SEL), primera imagen (HERO_SEL: toda <img> cumple el último selector), metas de
+    fecha (la primera por clave, como select_one) y los primeros <time>/<time datetime>.
+    """
+    found = {"body": None, "scopes": [], "date": None, "img": None,
+             "metas": {}, "time_dt": None, "time": None}
+    for tag in soup.find_all(True):
+        name = tag.name
+        if name == "meta":
+            for attr in ("property", "name"):
+                value = tag.get(attr)
+                if value is not None:
+                    found["metas"].setdefault((attr, value), tag)
+        elif name == "img":
+            if found["img"] is None:
+                found["img"] = tag
+        elif name == "time":
+            if found["time"] is None:
+                found["time"] = tag
+            if found["time_dt"] is None and tag.has_attr("datetime"):
+                found["time_dt"] = tag
+        classes = tag.get("class") or ()
+        if found["body"] is None and _matches(tag, classes, BODY_MATCH):
+            found["body"] = tag
+        if found["date"] is None and _matches(tag, classes, DATE_TEXT_MATCH):
+            found["date"] = tag
+        if _matches(tag, classes, SCOPE_MATCH):
+            found["scopes"].append(tag)
+    return found
+
+def price_sentence(text):
+    """
+    Igual que PRICE_SENT_RE.search(text): la oración del primer "precio" empieza tras el punto
+    anterior. Sin punto después no hay coincidencia y no se busca (la regex sola es cuadrática
+    en textos largos sin puntos, p. ej. tablas de tarifas).
+    """
+    m = PRICE_STEM_RE.search(text)
+    if not m or text.find(".", m.end()) < 0:
+        return None
+    return PRICE_SENT_RE.search(text, text.rfind(".", 0, m.start()) + 1)
+
+def extract_detail(html, url):
+    """Imagen, teléfono, precio, detalles y fecha de una ficha (etiquetas ubicadas con scan_detail)."""
+    soup = make_soup(html)
+    found = scan_detail(soup)
+    body_el = found["body"]
+    body_txt = clean_text(body_el.get_text(" ")) if body_el else None
+
+    imagen = None
+    hero = found["img"]
+    if hero and hero.get("src"):
+        imagen = absolutize(domain_of(url) or "https://www.fontur.com.co", hero.get("src"))
+
+    scopes = [el.get_text(" ") for el in found["scopes"]]
+    if not scopes:
+        scopes = [body_txt or ""]
+
+    tel = None
+    for scope_text in scopes:
+        m = PHONE_RE.search(scope_text)
+        if m:
+            tel = clean_text(m.group(0))
+            break
+
+    precio = None
+    for scope_text in scopes:
+        if PRICE_WORD_RE.search(scope_text):
+            sent = price_sentence(scope_text)
+            if sent:
+                precio = clean_text(sent.group(1))
+                break
+
+    return {
+        "imagen": imagen,
+        "telefono": tel,
+        "precio": precio,
+        "detalles": body_txt,
+        # Fecha de publicación/actualización
+        "_pub_dt": extract_pub_date(soup, found=found),
+        "_node_id": extract_node_id(soup, url),
+    }
+
+# Perfiles por departamento (valores por defecto de los scripts individuales)
+DEPARTAMENTOS = {
+    "huila": {
+        "departamento": "Huila",
+        "url": "https://www.fontur.com.co/es/search/node?keys=huila&page=0%2C0%2C0%2C0%2C0%2C0%2C0%2C",
+        "out": "fontur_huila_2019plus",
+    },
+    "tolima": {
+        "departamento": "Tolima",
+        "url": "https://www.fontur.com.co/es/search/node?keys=tolima&page=0%2C0%2C0%2C0%2C0%2C0%2C0%2C0",
+        "out": "fontur_tolima_2019plus",
+    },
+    "caqueta": {
+        "departamento": "Caquetá",
+        "url": "https://www.fontur.com.co/es/search/node?keys=caquet%C3%A1&page=0%2C0%2C0%2C0%2C0%2C0%2C0%2C0%2C0%2C0%2C0",
+        "out": "fontur_caqueta_2019plus",
+    },
+    "putumayo": {
+        "departamento": "Putumayo",
+        "url": "https://www.fontur.com.co/es/search/node?keys=putumayo&page=0%2C0%2C0%2C0%2C0%2C0%2C0%2C0%2C0%2C0%2C0",
+        "out": "fontur_putumayo_2019plus",
+    },
+}
+
+# Claves objetivo y formateo
+TARGET_FIELDS = [
+    "titulo","categoria","descripcion","enlace","imagen","ubicacion","tipo",
+    "fecha_extraccion","precio","telefono","detalles"
+]
+
+def listing_fingerprint(item):
+    # Lo que muestra el listado; si cambia, la ficha se vuelve a enriquecer
+    txt = f"{item.get('titulo') or ''}|{item.get('descripcion') or ''}"
+    return hashlib.sha1(txt.encode("utf-8")).hexdigest()
+
+def content_fingerprint(record):
+    # Registro formateado sin fecha_extraccion (cambia en cada corrida)
+    data = {k: record.get(k) for k in TARGET_FIELDS if k != "fecha_extraccion"}
+    return hashlib.sha1(json.dumps(data, sort_keys=True, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+def format_output(raw, defaults):
+    out = {}
+    out["titulo"] = raw.get("titulo") or ""
+    out["categoria"] = (raw.get("categoria") or "").strip() or None
+    desc = raw.get("descripcion")
+    out["descripcion"] = desc if (desc is None or isinstance(desc, str)) else clean_text(str(desc))
+    out["enlace"] = raw.get("enlace") or ""
+    out["imagen"] = raw.get("imagen") or None
+    out["ubicacion"] = raw.get("ubicacion") or defaults.get("departamento") or ""
+    out["tipo"] = raw.get("tipo") or "resultado_busqueda"
+    out["fecha_extraccion"] = raw.get("fecha_extraccion") or datetime.utcnow().isoformat()
+    price = raw.get("precio")
+    out["precio"] = price if (price and str(price).strip()) else "Consultar"
+    phone = raw.get("telefono")
+    out["telefono"] = phone.strip() if isinstance(phone, str) else ""
+    details = raw.get("detalles")
+    out["detalles"] = details.strip() if isinstance(details, str) else ""
+    return out
+
+# -------------------------
+# Scraper
+# -------------------------
+class FonturDeptScraper:
+    def __init__(self, base_search, departamento="Huila", headless=True, max_pages=20, wait_sec=12,
+                 min_year=2019, keep_undated=False, backend="http", delay=0.2, workers=8, per_host=4,
+                 fetcher=None, pool=None, details=None, prefilter=True, cache=None, offline=False,
+                 state=None, recheck_days=30, journal=None, block="medios", listing_ahead=3,
+                 node_index=None):
+        self.departamento = departamento
+        self.base_domain = "https://www.fontur.com.co"
+        self.base_search = self.normalize_search_url(base_search)
+        self.max_pages = max_pages
+        self.wait_sec = wait_sec
+        self.min_year = int(min_year)
+        self.keep_undated = bool(keep_undated)
+        self.delay = float(delay)
+        self.results = []
+        self.visited = set()
+        self.workers = max(1, int(workers))
+        # fetcher/pool/details pueden venir compartidos desde FonturMultiScraper
+        self._owns_resources = fetcher is None
+        self.fetcher = fetcher or HybridFetcher(backend=backend, headless=headless, wait_sec=wait_sec,
+                                                pool_size=self.workers, per_host=per_host,
+                                                cache=cache, offline=offline, block=block)
+        self._pool = pool or ThreadPoolExecutor(max_workers=self.workers)
+        self.details = details if details is not None else {}  # enlace -> datos de la ficha
+        self.prefilter = bool(prefilter)
+        self.prefilter_stats = {"listado": 0, "cabecera": 0, "indice": 0, "corte": 0}
+        # Índice nodo -> fecha (NodeDateIndex), compartido entre departamentos; None = sin índice
+        self.node_index = node_index
+        self._stats_lock = threading.Lock()
+        # Modo incremental: state es {url canónica: {...}} (None = corrida completa)
+        self.state = state
+        self.recheck_days = float(recheck_days)
+        self.delta = []
+        self.incremental_stats = {"conocidas": 0, "nuevas": 0, "cambiadas": 0}
+        # Diario JSONL + checkpoint (RunJournal); None = todo en memoria hasta el final
+        self.journal = journal
+        # Páginas del listado descargadas por adelantado una vez conocida la última
+        self.listing_ahead = max(0, int(listing_ahead))
+        self.last_page = None
+        self.listing_stats = {"paginas": 0, "adelantadas": 0, "descartadas": 0}
+
+    def close(self):
+        if not self._owns_resources:
+            return
+        if self.journal:
+            self.journal.close()
+        self._pool.shutdown(wait=True)
+        self.fetcher.close()
+
+    # ---- URLs
+    def normalize_search_url(self, base_search):
+        if base_search.lower().startswith("http"):
+            return base_search
+        return f"{self.base_domain}/es/search/node?{urlencode({'keys': base_search})}"
+
+    def page_url(self, page_idx):
+        parsed = urlparse(self.base_search)
+        q = parse_qs(parsed.query)
+        q["page"] = [str(page_idx)]
+        query = []
+        for k, vals in q.items():
+            for v in vals:
+                query.append((k, v))
+        new_q = urlencode(query)
+        return parsed._replace(query=new_q).geturl()
+
+    # ---- Helpers de carga
+    def _pause(self):
+        # El navegador ya espera al cargar; con HTTP basta una pausa corta de cortesía
+        if self.delay > 0:
+            jitter(self.delay, self.delay * 2)
+
+    def _count_prefilter(self, key):
+        with self._stats_lock:
+            self.prefilter_stats[key] += 1
+
+    def _too_old(self, dt):
+        return dt is not None and dt.year < self.min_year
+
+    def _index_too_old(self, item):
+        """Descarte por el índice de nodos: fecha ya conocida o ID bajo el corte de min_year."""
+        node_id, fecha = self.node_index.lookup(item["enlace"])
+        if fecha is not None:
+            if fecha.year < self.min_year:
+                self._count_prefilter("indice")
+                return True
+            return False
+        cutoff = self.node_index.cutoff(self.min_year)
+        if node_id is None or cutoff is None or node_id >= cutoff:
+            return False
+        if self.node_index.spot_check(self.min_year):
+            item["_muestreo"] = True  # se descarga para validar el corte
+            return False
+        self._count_prefilter("corte")
+        return True
+
+    def _head_too_old(self, head_html, headers):
+        # stop_early del fetcher: corta la descarga si el <head> ya basta para descartar
+        return self._too_old(head_pub_date(head_html, headers))
+
+    def _get_soup(self, url):
+        page = self.fetcher.fetch(url)
+        if page is None:
+            return None
+        return make_soup(page.html)
+
+    def _fetch_listing(self, page):
+        soup = self._get_soup(self.page_url(page))
+        self._pause()
+        return soup
+
+    def _prefetch(self, window, page):
+        # Mantiene en vuelo hasta listing_ahead páginas siguientes (sin pasar de la última)
+        if self.last_page is None:
+            return
+        for p in range(page + 1, min(self.last_page, page + self.listing_ahead) + 1):
+            if p not in window:
+                window[p] = self._pool.submit(self._fetch_listing, p)
+                self.listing_stats["adelantadas"] += 1
+
+    # ---- Scrape principal
+    def scrape(self):
+        start = self._restore() if self.journal else 0
+        if start is None:
+            return self.results  # la corrida anterior ya había terminado este departamento
+        window = {}  # página -> Future del listado descargado por adelantado
+        try:
+            self._scrape_pages(start, window)
+        finally:
+            for fut in window.values():
+                if not fut.cancel():
+                    self.listing_stats["descartadas"] += 1  # ya estaba en curso o descargada
+        return self.results
+
+    def _scrape_pages(self, start, window):
+        for page in range(start, self.max_pages):
+            if self.last_page is not None and page > self.last_page:
+                self._checkpoint(None)
+                break
+            url = self.page_url(page)
+            fut = window.pop(page, None)
+            soup = fut.result() if fut is not None else self._fetch_listing(page)
+            self.listing_stats["paginas"] += 1
+            if self.last_page is None and soup is not None:
+                found = extract_last_page(soup)
+                if found is not None:
+                    self.last_page = min(max(found, page), self.max_pages - 1)
+                    print(f"[INFO] {self.departamento}: paginador -> {self.last_page + 1} páginas")
+            # Las siguientes páginas se descargan mientras se enriquece esta
+            self._prefetch(window, page)
+
+            links = self._find_result_links(soup) if soup else []
+            if not links:
+                if page == 0:
+                    print("[INFO] No se hallaron resultados en la búsqueda (selectores vacíos).")
+                self._checkpoint(None)
+                break
+
+            candidates = []
+            seen_page = set()
+            for link in links:
+                item = self._parse_link_item(link, list_url=url)
+                if not item or not item.get("enlace"):
+                    continue
+                if item["enlace"] in self.visited or item["enlace"] in seen_page:
+                    continue
+                seen_page.add(item["enlace"])
+                if self.state is not None and self._carry_known(item):
+                    if self.journal and item["enlace"] in self.visited:
+                        self.journal.append(self.results[-1])
+                    continue
+                # Pre-filtro: la fecha del listado ya descarta la ficha sin descargarla
+                if self.prefilter and self._too_old(item.get("_list_dt")):
+                    self._count_prefilter("listado")
+                    continue
+                if self.prefilter and self.node_index is not None and self._index_too_old(item):
+                    continue
+                candidates.append(item)
+
+            # Enriquecer y extraer fecha (en paralelo; se conserva el orden del listado)
+            new_count = 0
+            for item in self._pool.map(self._enrich_one, candidates):
+                pub_dt = item.get("_pub_dt")
+
+                # Filtro por fecha
+                if not self._passes_date(pub_dt.year if pub_dt else None):
+                    if self.state is not None:
+                        self._journal_state(self._remember(item, None))
+                    continue
+
+                item_fmt = format_output(item, defaults={"departamento": self.departamento})
+                self.results.append(item_fmt)
+                self.visited.add(item["enlace"])
+                new_count += 1
+                remembered = self._remember(item, item_fmt) if self.state is not None else None
+                if self.journal:
+                    self.journal.append(item_fmt, delta=bool(remembered and remembered[1]),
+                                        estado=self._state_entry(remembered))
+
+            if new_count == 0:
+                self._checkpoint(None)
+                break
+            self._checkpoint(page + 1)
+        else:
+            self._checkpoint(None)
+
+    # ---- Diario / reanudación
+    def _restore(self):
+        """Recarga registros, visitados y estado incremental del diario; devuelve la página siguiente."""
+        for line in self.journal.lines():
+            rec = line.get("registro")
+            if rec is not None:
+                self.results.append(rec)
+                self.visited.add(rec["enlace"])
+                if line.get("delta"):
+                    self.delta.append(rec)
+            if self.state is not None and line.get("estado"):
+                key, entry = line["estado"]
+                self.state[key] = entry
+        ckpt = self.journal.checkpoint_data()
+        self.visited.update(ckpt.get("visitados", []))
+        if self.results or ckpt:
+            print(f"[INFO] {self.departamento}: reanudando con {len(self.results)} registros del diario")
+        return ckpt.get("pagina", 0)
+
+    def _checkpoint(self, next_page):
+        # next_page=None marca el departamento como terminado
+        if self.journal:
+            self.journal.checkpoint(next_page, self.visited)
+
+    def _state_entry(self, remembered):
+        if not remembered:
+            return None
+        return [remembered[0], self.state[remembered[0]]]
+
+    def _journal_state(self, remembered):
+        if self.journal and remembered:
+            self.journal.append(None, estado=self._state_entry(remembered))
+
+    def _passes_date(self, year):
+        if year is None:
+            return self.keep_undated
+        return year >= self.min_year
+
+    # ---- Modo incremental
+    def _carry_known(self, item):
+        """True si el enlace ya está en el estado sin cambios en el listado (no se re-enriquece)."""
+        prev = self.state.get(canonical_url(item["enlace"]))
+        if not prev or prev.get("fp_listado") != item.get("_fp_listado"):
+            return False
+        if time.time() - prev.get("revisado", 0) > self.recheck_days * 86400:
+            return False
+        # Si el filtro de fecha cambió de veredicto, se vuelve a procesar
+        if self._passes_date(prev.get("anio")) != (prev.get("record") is not None):
+            return False
+        if prev.get("record") is not None:
+            self.results.append(prev["record"])
+            self.visited.add(item["enlace"])
+        self.incremental_stats["conocidas"] += 1
+        return True
+
+    def _remember(self, item, item_fmt):
+        """Actualiza el estado; devuelve (clave, va_al_delta) o None si no se registró nada."""
+        if item.get("tipo") != "ficha":
+            return None  # la ficha no se pudo descargar: que se reintente en la próxima corrida
+        key = canonical_url(item["enlace"])
+        prev = self.state.get(key)
+        fp = content_fingerprint(item_fmt) if item_fmt else None
+        pub_dt = item.get("_pub_dt")
+        self.state[key] = {
+            "fp_listado": item.get("_fp_listado"),
+            "fp": fp,
+            "anio": pub_dt.year if pub_dt else None,
+            "record": item_fmt,
+            "revisado": time.time(),
+        }
+        if item_fmt is None:
+            return key, False
+        if prev is None or prev.get("record") is None:
+            self.incremental_stats["nuevas"] += 1
+            self.delta.append(item_fmt)
+            return key, True
+        if prev.get("fp") != fp:
+            self.incremental_stats["cambiadas"] += 1
+            self.delta.append(item_fmt)
+            return key, True
+        return key, False
+
+    def snapshot(self):
+        """Foto completa: resultados de la corrida + registros conocidos que no se volvieron a ver."""
+        rows = list(self.journal.records()) if self.journal else self.results
+        if self.state is None:
+            return rows
+        seen = {canonical_url(r["enlace"]) for r in rows}
+        extra = [v["record"] for k, v in self.state.items() if v.get("record") and k not in seen]
+        return rows + extra
+
+    def _find_result_links(self, soup):
+        selectors = [
+            "main h3 a[href]",
+            "#block-system-main h3 a[href]",
+            ".search-results h3 a[href]",
+            "h3 a[href]"
+        ]
+        for sel in selectors:
+            found = soup.select(sel)
+            if found:
+                return found
+        return []
+
+    def _parse_link_item(self, a_tag, list_url):
+        now_iso = datetime.utcnow().isoformat()
+        titulo = clean_text(a_tag.get_text())
+        enlace = absolutize(self.base_domain, a_tag.get("href"))
+
+        descripcion = None
+        cont = a_tag.find_parent()
+        if cont:
+            cont_txt = clean_text(cont.get_text(" "))
+            if cont_txt and titulo and len(cont_txt) > len(titulo) + 10:
+                descripcion = clean_text(cont_txt.replace(titulo, "", 1))[:300]
+
+        item = {
+            "titulo": titulo or "",
+            "categoria": pick_category(descripcion or titulo or ""),
+            "descripcion": descripcion,  # puede quedar como None
+            "enlace": enlace or "",
+            "imagen": None,
+            "ubicacion": self.departamento,
+            "tipo": "resultado_busqueda",
+            "fecha_extraccion": now_iso,
+            "precio": None,
+            "telefono": None,
+            "detalles": None,
+            "_list_url": list_url,
+            "_list_dt": extract_listing_date(a_tag.find_parent(["li", "article", "div"])) if self.prefilter else None,
+        }
+        item["_fp_listado"] = listing_fingerprint(item)
+        return item
+
+    def _enrich_one(self, item):
+        fetched = item.get("enlace") not in self.details
+        self._enrich_detail(item)
+        if fetched:
+            self._pause()
+        return item
+
+    def _enrich_detail(self, item):
+        if not item.get("enlace"):
+            return
+        try:
+            detail = self.details.get(item["enlace"])
+            if detail is None:
+                detail = self._fetch_detail(item["enlace"])
+                if detail is not None:
+                    self.details[item["enlace"]] = detail
+            if detail is None:
+                item["_pub_dt"] = None
+                return
+            if self.node_index is not None:
+                self.node_index.record(item["enlace"], detail.get("_node_id"), detail["_pub_dt"],
+                                       spot=item.get("_muestreo"), min_year=self.min_year)
+
+            if not item.get("imagen"):
+                item["imagen"] = detail["imagen"]
+
+            body_txt = detail["detalles"]
+            if body_txt and (not item.get("descripcion") or len(item["descripcion"]) < 60):
+                item["descripcion"] = (body_txt[:500] + "…") if len(body_txt) > 500 else body_txt
+
+            item["_pub_dt"] = detail["_pub_dt"]
+            item["telefono"] = detail["telefono"]
+            item["precio"] = detail["precio"]
+            item["detalles"] = body_txt
+            item["tipo"] = "ficha"
+
+        except Exception:
+            item["_pub_dt"] = None
+
+    def _fetch_detail(self, url):
+        """Descarga y extrae la ficha una sola vez; el resultado se reutiliza entre departamentos."""
+        page = self.fetcher.fetch(url, stop_early=self._head_too_old if self.prefilter else None)
+        if page is None:
+            return None
+        if page.via == "head":
+            # Descarga cortada tras el <head>: la ficha es anterior a min_year
+            self._count_prefilter("cabecera")
+            return {"imagen": None, "telefono": None, "precio": None, "detalles": None,
+                    "_pub_dt": head_pub_date(page.html, page.headers),
+                    "_node_id": extract_node_id(make_soup(page.html), url)}
+        return extract_detail(page.html, url)
+
+class FonturMultiScraper:
+    """
+    Varios departamentos en una sola corrida: una sesión HTTP (y a lo sumo un Chrome),
+    un pool de hilos y un caché de fichas compartidos. Cada ficha se descarga una vez
+    aunque aparezca en la búsqueda de varios departamentos.
+    """
+    def __init__(self, deptos, headless=True, max_pages=20, wait_sec=12, min_year=2019,
+                 keep_undated=False, backend="http", delay=0.2, workers=8, per_host=4, prefilter=True,
+                 cache=None, offline=False, incremental=False, recheck_days=30, resume=None,
+                 block="medios", listing_ahead=3, node_index=None):
+        workers = max(1, int(workers))
+        self.node_index = node_index
+        self.fetcher = HybridFetcher(backend=backend, headless=headless, wait_sec=wait_sec,
+                                     pool_size=workers, per_host=per_host, cache=cache, offline=offline,
+                                     block=block)
+        self._pool = ThreadPoolExecutor(max_workers=workers)
+        self.details = {}
+        self.deptos_por_enlace = {}  # enlace -> [departamentos]
+        self.estados = {}            # slug -> (ruta, estado) en modo incremental
+        self.scrapers = {}
+        for slug in deptos:
+            perfil = DEPARTAMENTOS[slug]
+            if incremental:
+                path = state_path(perfil["out"])
+                self.estados[slug] = (path, load_state(path))
+            self.scrapers[slug] = FonturDeptScraper(
+                base_search=perfil["url"],
+                departamento=perfil["departamento"],
+                max_pages=max_pages,
+                wait_sec=wait_sec,
+                min_year=min_year,
+                keep_undated=keep_undated,
+                delay=delay,
+                workers=workers,
+                fetcher=self.fetcher,
+                pool=self._pool,
+                details=self.details,
+                prefilter=prefilter,
+                state=self.estados[slug][1] if incremental else None,
+                recheck_days=recheck_days,
+                listing_ahead=listing_ahead,
+                node_index=node_index,
+                journal=RunJournal(perfil["out"], resume=resume) if resume is not None else None,
+            )
+
+    def scrape(self):
+        for slug, scraper in self.scrapers.items():
+            antes = len(self.details)
+            print(f"[INFO] {scraper.departamento}: buscando...")
+            scraper.scrape()
+            print(f"[INFO] {scraper.departamento}: {len(scraper.results)} registros "
+                  f"({len(self.details) - antes} fichas nuevas descargadas)")
+            for r in scraper.results:
+                self.deptos_por_enlace.setdefault(r["enlace"], []).append(scraper.departamento)
+        return {slug: scraper.results for slug, scraper in self.scrapers.items()}
+
+    def save_states(self):
+        for path, state in self.estados.values():
+            save_state(path, state)
+
+    def close(self):
+        for scraper in self.scrapers.values():
+            if scraper.journal:
+                scraper.journal.close()
+        self._pool.shutdown(wait=True)
+        self.fetcher.close()
+
+# -------------------------
+# Persistencia
+# -------------------------
+def save_json_array(path, rows):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(rows, f, ensure_ascii=False, indent=2)
+
+def save_csv(path, rows):
+    if not rows:
+        return
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        w = csv.DictWriter(f, fieldnames=TARGET_FIELDS)
+        w.writeheader()
+        for r in rows:
+            w.writerow({k: r.get(k) for k in TARGET_FIELDS})
+
+def state_path(out_prefix):
+    return f"{out_prefix}_estado.json"
+
+def load_state(path):
+    if not path or not os.path.exists(path):
+        return {}
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+def save_state(path, state):
+    # Escritura atómica para no corromper el estado si la corrida se interrumpe
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(state, f, ensure_ascii=False)
+    os.replace(tmp, path)
+
+class NodeDateIndex:
+    """
+    Índice persistente de fechas de publicación por nodo de Drupal y por URL canónica
+    (las URLs con alias /es/noticias/... se resuelven a su nodo con extract_node_id).
+    - lookup(url): (id de nodo, fecha) conocidos, sin descargar nada
+    - cutoff(min_year): el mayor ID conocido c tal que, entre los (al menos min_samples) nodos
+      con ID <= c, la fracción publicada en o después de min_year no supera tolerance. Los IDs crecen
+      con el tiempo, así que un nodo por debajo del corte casi seguro es anterior a min_year
+    - spot_check(min_year): uno de cada spot_every nodos bajo el corte se descarga igual; si
+      resulta reciente queda registrado y el corte se recalcula hacia abajo
+    Escritura atómica, como el estado incremental.
+    """
+    def __init__(self, path, min_samples=20, tolerance=0.01, spot_every=10):
+        self.path = path
+        self.min_samples = int(min_samples)
+        self.tolerance = float(tolerance)
+        self.spot_every = max(1, int(spot_every))
+        self.nodos = {}  # id (str) -> "AAAA-MM-DD"
+        self.urls = {}   # url canónica -> [id o None, "AAAA-MM-DD"]
+        if path and os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            self.nodos, self.urls = data.get("nodos", {}), data.get("urls", {})
+        self._lock = threading.Lock()
+        self._cutoffs = {}  # min_year -> corte (se invalida al registrar)
+        self._below = 0
+        self.stats = {"nuevas": 0, "muestreo": 0, "muestreo_fallido": 0}
+
+    def __len__(self):
+        return len(self.urls)
+
+    def lookup(self, url):
+        with self._lock:
+            key = canonical_url(url)
+            if key in self.urls:
+                node_id, fecha = self.urls[key]
+            else:
+                m = NODE_ID_RE.search(url)
+                node_id = int(m.group(1)) if m else None
+                fecha = self.nodos.get(str(node_id)) if node_id is not None else None
+        return node_id, (datetime.strptime(fecha, "%Y-%m-%d") if fecha else None)
+
+    def record(self, url, node_id, pub_dt, spot=False, min_year=None):
+        if pub_dt is None:
+            return
+        fecha = pub_dt.strftime("%Y-%m-%d")
+        with self._lock:
+            key = canonical_url(url)
+            if key not in self.urls:
+                self.stats["nuevas"] += 1
+            self.urls[key] = [node_id, fecha]
+            if node_id is not None:
+                self.nodos[str(node_id)] = fecha
+                self._cutoffs.clear()
+            if spot:
+                self.stats["muestreo"] += 1
+                if min_year is not None and pub_dt.year >= min_year:
+                    self.stats["muestreo_fallido"] += 1
+
+    def cutoff(self, min_year):
+        with self._lock:
+            if min_year not in self._cutoffs:
+                pares = sorted((int(k), int(v[:4]) >= min_year) for k, v in self.nodos.items())
+                # El corte es el último ID conocido del prefijo aceptado (no el siguiente):
+                # entre ese y el primer reciente puede haber nodos sin fechar de cualquier año
+                corte, recientes = None, 0
+                for i, (node_id, reciente) in enumerate(pares, 1):
+                    recientes += reciente
+                    if i >= self.min_samples and recientes <= self.tolerance * i:
+                        corte = node_id
+                self._cutoffs[min_year] = corte
+            return self._cutoffs[min_year]
+
+    def spot_check(self, min_year):
+        with self._lock:
+            self._below += 1
+            return self._below % self.spot_every == 0
+
+    def summary(self, min_year):
+        corte = self.cutoff(min_year)
+        st = self.stats
+        return (f"Índice de nodos: {len(self.urls)} URLs / {len(self.nodos)} nodos fechados (+{st['nuevas']}), "
+                f"corte para {min_year}: " + (f"nodo {corte}" if corte is not None else "sin datos suficientes")
+                + (f"; muestreo {st['muestreo']} ({st['muestreo_fallido']} recientes bajo el corte)"
+                   if st["muestreo"] else ""))
+
+    def save(self):
+        if not self.path:
+            return
+        with self._lock:
+            data = {"nodos": self.nodos, "urls": self.urls}
+        tmp = f"{self.path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(tmp, self.path)
+
+class RunJournal:
+    """
+    Diario de una corrida: <out>_parcial.jsonl (una línea por registro aceptado, en el
+    orden en que se producen) y <out>_parcial.json (checkpoint con la página siguiente
+    y los enlaces visitados). Con resume=False se descarta lo que hubiera.
+    """
+    def __init__(self, out_prefix, resume=False):
+        self.path = f"{out_prefix}_parcial.jsonl"
+        self.ckpt_path = f"{out_prefix}_parcial.json"
+        if not resume:
+            self.discard()
+        self._fh = open(self.path, "a", encoding="utf-8")
+
+    def lines(self):
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, "r", encoding="utf-8") as f:
+            for raw in f:
+                try:
+                    yield json.loads(raw)
+                except ValueError:
+                    break  # última línea a medio escribir (corte abrupto)
+
+    def records(self):
+        self._fh.flush()
+        for line in self.lines():
+            if line.get("registro") is not None:
+                yield line["registro"]
+
+    def append(self, record, delta=False, estado=None):
+        line = {"registro": record}
+        if delta:
+            line["delta"] = True
+        if estado:
+            line["estado"] = estado
+        self._fh.write(json.dumps(line, ensure_ascii=False) + "\n")
+        self._fh.flush()
+
+    def checkpoint_data(self):
+        if not os.path.exists(self.ckpt_path):
+            return {}
+        with open(self.ckpt_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def checkpoint(self, next_page, visited):
+        os.fsync(self._fh.fileno())
+        tmp = f"{self.ckpt_path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"pagina": next_page, "visitados": sorted(visited)}, f, ensure_ascii=False)
+        os.replace(tmp, self.ckpt_path)
+
+    def discard(self):
+        for path in (self.path, self.ckpt_path):
+            if os.path.exists(path):
+                os.remove(path)
+
+    def close(self):
+        if not self._fh.closed:
+            self._fh.close()
+
+    def finish(self):
+        """La salida final ya se escribió: el diario deja de hacer falta."""
+        self.close()
+        self.discard()
+
+def write_outputs(rows, out_prefix, ts):
+    """Deduplica por enlace y escribe <out_prefix>_<ts>.json/.csv con las 11 claves."""
+    seen = set()
+    normalized = []
+    for r in rows:
+        link = r.get("enlace")
+        if link in seen:
+            continue
+        seen.add(link)
+        normalized.append({k: r.get(k) for k in TARGET_FIELDS})
+
+    json_path = f"{out_prefix}_{ts}.json"
+    csv_path = f"{out_prefix}_{ts}.csv"
+    save_json_array(json_path, normalized)
+    save_csv(csv_path, normalized)
+    return normalized, json_path, csv_path
+
+# -------------------------
+# CLI
+# -------------------------
+def build_parser(description):
+    ap = argparse.ArgumentParser(description=description)
+    ap.add_argument("--headless", action="store_true", help="Ejecutar Chrome en modo headless (solo si se usa el navegador).")
+    ap.add_argument("--backend", choices=BACKENDS, default="http",
+                    help="Descarga: 'http' (sesión keep-alive, Chrome solo como respaldo) o 'selenium' (todo con Chrome).")
+    ap.add_argument("--parser", choices=PARSERS, default=get_parser(),
+                    help="Motor HTML de BeautifulSoup (lxml es más rápido; ver bench_parsers.py).")
+    ap.add_argument("--block", choices=PERFILES, default="medios",
+                    help="Recursos que Chrome no descarga: 'medios' (imágenes, fuentes, video, trackers), "
+                         "'agresivo' (además CSS) o 'ninguno'.")
+    ap.add_argument("--delay", type=float, default=0.2,
+                    help="Pausa base de cortesía entre solicitudes, en segundos (se aplica con jitter x1-x2).")
+    ap.add_argument("--workers", type=int, default=8, help="Fichas enriquecidas en paralelo por página del listado.")
+    ap.add_argument("--per-host", type=int, default=4, help="Máximo de descargas simultáneas por host.")
+    ap.add_argument("--pages", type=int, default=20, help="Máximo de páginas (?page=N).")
+    ap.add_argument("--listing-ahead", type=int, default=3,
+                    help="Páginas del listado descargadas por adelantado (0 = una a una).")
+    ap.add_argument("--min-year", type=int, default=2019, help="Año mínimo de publicación/actualización (inclusive).")
+    ap.add_argument("--keep-undated", action="store_true",
+                    help="Si se especifica, conserva fichas sin fecha detectable (por defecto se descartan).")
+    ap.add_argument("--no-prefilter", dest="prefilter", action="store_false",
+                    help="Desactiva el pre-filtro por fecha (listado/Last-Modified/<head>) y descarga todas las fichas.")
+    ap.add_argument("--node-index", default="fontur_nodos.json",
+                    help="Índice persistente nodo/URL -> fecha de publicación (compartido por todos los departamentos).")
+    ap.add_argument("--no-node-index", dest="node_index", action="store_const", const=None,
+                    help="No usar ni actualizar el índice de nodos.")
+    ap.add_argument("--cache-dir", default=".fontur_cache", help="Carpeta del caché de páginas.")
+    ap.add_argument("--cache-ttl", type=float, default=24,
+                    help="Horas durante las que una página cacheada se usa sin revalidar.")
+    ap.add_argument("--cache-max-mb", type=float, default=500, help="Tamaño máximo del caché (LRU).")
+    ap.add_argument("--no-cache", dest="cache", action="store_false", help="No usar el caché de páginas.")
+    ap.add_argument("--offline", action="store_true",
+                    help="Solo caché: no hace peticiones (útil para re-ejecutar cambios de parser).")
+    ap.add_argument("--incremental", action="store_true",
+                    help="Solo procesa enlaces nuevos o cambiados desde la última corrida y escribe un archivo _delta.")
+    ap.add_argument("--recheck-days", type=float, default=30,
+                    help="En modo incremental, re-enriquece fichas conocidas revisadas hace más de N días.")
+    ap.add_argument("--resume", action="store_true",
+                    help="Retoma una corrida interrumpida desde <out>_parcial.jsonl y su checkpoint.")
+    return ap
+
+def make_cache(args):
+    if not args.cache:
+        if args.offline:
+            raise SystemExit("--offline requiere el caché (quite --no-cache).")
+        return None
+    return PageCache(args.cache_dir, ttl_hours=args.cache_ttl, max_mb=args.cache_max_mb)
+
+def print_fetch_stats(fetcher, scrapers=()):
+    st = fetcher.stats
+    print(f"[OK] Descargas: http={st['http']} solo-head={st['head']} navegador={st['browser']} "
+          f"(respaldo={st['fallback']}, errores={st['errors']})")
+    if fetcher.cache is not None:
+        print(f"[OK] Caché: {st['cache']} aciertos, {st['revalidated']} revalidadas (304), "
+              f"{st['miss']} sin copia offline; {len(fetcher.cache)} páginas en {fetcher.cache.cache_dir}")
+    listado = sum(s.prefilter_stats["listado"] for s in scrapers)
+    cabecera = sum(s.prefilter_stats["cabecera"] for s in scrapers)
+    indice = sum(s.prefilter_stats["indice"] for s in scrapers)
+    corte = sum(s.prefilter_stats["corte"] for s in scrapers)
+    if listado or cabecera or indice or corte:
+        print(f"[OK] Pre-filtro por fecha: {listado} descartadas por el listado, {cabecera} por Last-Modified/<head>, "
+              f"{indice} por fecha ya indexada, {corte} por ID de nodo bajo el corte")
+    paginas = sum(s.listing_stats["paginas"] for s in scrapers)
+    adelantadas = sum(s.listing_stats["adelantadas"] for s in scrapers)
+    if adelantadas:
+        descartadas = sum(s.listing_stats["descartadas"] for s in scrapers)
+        print(f"[OK] Listados: {paginas} páginas procesadas, {adelantadas} descargadas por adelantado "
+              f"({descartadas} sin usar por corte temprano)")
+    bloqueo = fetcher.browser.blocker.summary()
+    if bloqueo:
+        print(f"[OK] {bloqueo}")
+
+def print_node_index(index, min_year):
+    if index is not None:
+        print(f"[OK] {index.summary(min_year)} -> {index.path}")
+
+def print_incremental_stats(scraper, delta_json):
+    st = scraper.incremental_stats
+    print(f"[OK] Incremental: {st['nuevas']} nuevas, {st['cambiadas']} cambiadas, "
+          f"{st['conocidas']} conocidas sin re-enriquecer -> {delta_json}")
+
+def main_departamento(slug):
+    """CLI de un solo departamento (huilaF.py, tolimaF.py, caquetaF.py, putumayoF.py)."""
+    perfil = DEPARTAMENTOS[slug]
+    nombre = perfil["departamento"]
+    ap = build_parser(f"Scraper de Fontur por departamento ({nombre} por defecto, filtro fecha >= 2019, formato fijo).")
+    ap.add_argument("--url", default=perfil["url"],
+                    help=f"URL base de búsqueda (con keys=...) o solo la clave (ej. '{nombre.lower()}').")
+    ap.add_argument("--departamento", default=nombre, help="Valor que irá en 'ubicacion'.")
+    ap.add_argument("--out", default=perfil["out"], help="Prefijo de salida (sin extensión).")
+    ap.add_argument("--state", default=None, help="Archivo de estado del modo incremental (por defecto <out>_estado.json).")
+    args = ap.parse_args()
+    set_parser(args.parser)
+    state_file = args.state or state_path(args.out)
+
+    scraper = FonturDeptScraper(
+        base_search=args.url,
+        departamento=args.departamento,
+        headless=args.headless,
+        max_pages=args.pages,
+        wait_sec=12,
+        min_year=args.min_year,
+        keep_undated=args.keep_undated,
+        backend=args.backend,
+        delay=args.delay,
+        workers=args.workers,
+        per_host=args.per_host,
+        prefilter=args.prefilter,
+        cache=make_cache(args),
+        offline=args.offline,
+        block=args.block,
+        listing_ahead=args.listing_ahead,
+        node_index=NodeDateIndex(args.node_index) if args.node_index else None,
+        state=load_state(state_file) if args.incremental else None,
+        recheck_days=args.recheck_days,
+        journal=RunJournal(args.out, resume=args.resume)
+    )
+
+    try:
+        scraper.scrape()
+        ts = datetime.utcnow().strftime("%Y%m%d-%H%M%S")
+        normalized, json_path, csv_path = write_outputs(scraper.snapshot(), args.out, ts)
+
+        print(f"[OK] Registros (>= {args.min_year}{' + sin fecha' if args.keep_undated else ''}): {len(normalized)}")
+        print(f"[OK] JSON: {json_path}")
+        print(f"[OK] CSV: {csv_path}")
+        if args.incremental:
+            delta, delta_json, _ = write_outputs(scraper.delta, args.out, f"{ts}_delta")
+            save_state(state_file, scraper.state)
+            print_incremental_stats(scraper, delta_json)
+        scraper.journal.finish()
+        print_fetch_stats(scraper.fetcher, [scraper])
+        print_node_index(scraper.node_index, args.min_year)
+    finally:
+        if scraper.node_index is not None:
+            scraper.node_index.save()
+        scraper.close()
+
+def main():
+    ap = build_parser("Scraper de Fontur para varios departamentos en una sola corrida (filtro fecha >= 2019, formato fijo).")
+    ap.add_argument("--deptos", nargs="+", choices=list(DEPARTAMENTOS), default=list(DEPARTAMENTOS),
+                    help="Departamentos a procesar (por defecto los cuatro).")
+    args = ap.parse_args()
+    set_parser(args.parser)
+
+    multi = FonturMultiScraper(
+        deptos=args.deptos,
+        headless=args.headless,
+        max_pages=args.pages,
+        wait_sec=12,
+        min_year=args.min_year,
+        keep_undated=args.keep_undated,
+        backend=args.backend,
+        delay=args.delay,
+        workers=args.workers,
+        per_host=args.per_host,
+        prefilter=args.prefilter,
+        cache=make_cache(args),
+        offline=args.offline,
+        block=args.block,
+        listing_ahead=args.listing_ahead,
+        node_index=NodeDateIndex(args.node_index) if args.node_index else None,
+        incremental=args.incremental,
+        recheck_days=args.recheck_days,
+        resume=args.resume
+    )
+
+    try:
+        multi.scrape()
+        ts = datetime.utcnow().strftime("%Y%m%d-%H%M%S")
+        for slug, scraper in multi.scrapers.items():
+            out = DEPARTAMENTOS[slug]["out"]
+            normalized, json_path, csv_path = write_outputs(scraper.snapshot(), out, ts)
+            print(f"[OK] {scraper.departamento}: {len(normalized)} registros -> {json_path} / {csv_path}")
+            if args.incremental:
+                _, delta_json, _ = write_outputs(scraper.delta, out, f"{ts}_delta")
+                print_incremental_stats(scraper, delta_json)
+        if args.incremental:
+            multi.save_states()
+        for scraper in multi.scrapers.values():
+            scraper.journal.finish()
+
+        compartidas = sum(1 for ds in multi.deptos_por_enlace.values() if len(ds) > 1)
+        index_path = f"fontur_deptos_{ts}.json"
+        save_json_array(index_path, [{"enlace": k, "departamentos": v} for k, v in multi.deptos_por_enlace.items()])
+        print(f"[OK] Fichas descargadas: {len(multi.details)} (compartidas entre departamentos: {compartidas})")
+        print(f"[OK] Índice enlace -> departamentos: {index_path}")
+        print_fetch_stats(multi.fetcher, multi.scrapers.values())
+        print_node_index(multi.node_index, args.min_year)
+    finally:
+        if multi.node_index is not None:
+            multi.node_index.save()
+        multi.close()
+
+if __name__ == "__main__":
+    main()
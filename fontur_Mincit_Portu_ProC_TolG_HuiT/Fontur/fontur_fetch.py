@@ -0,0 +1,465 @@
+# -*- coding: utf-8 -*-
+"""
+Backends de descarga para los scrapers de Fontur
+- HttpFetcher: requests.Session con pool keep-alive y reintentos/backoff (por defecto)
+- BrowserFetcher: Chrome/Selenium, se abre solo si alguna página lo necesita; bloquea
+  imágenes/fuentes/video/trackers según el perfil de bloqueo_recursos (block=...)
+- HybridFetcher: intenta HTTP y cae al navegador cuando la página depende de JavaScript
+  (cuerpo casi vacío, aviso de "habilite JavaScript" o bloqueo 403/429/5xx)
+- Tope de descargas simultáneas por host con HostLimiter (comun/descarga.py; los fetchers son
+  seguros entre hilos; el navegador es uno solo y se usa de a una página a la vez)
+- fetch(url, stop_early=fn): por HTTP lee en streaming hasta </head> y consulta fn(head, headers);
+  si devuelve True corta la descarga y entrega solo el <head> (Page.via == "head")
+- PageCache: caché en disco por URL canónica con ETag/Last-Modified, TTL, revalidación
+  condicional (304 reutiliza el cuerpo), LRU por tamaño y modo sin conexión (offline)
+
+- iter_sitemap: recorre sitemap.xml (índices y sub-sitemaps .gz) en streaming
+
+Todas las descargas devuelven un Page(url, status, html, headers, via).
+"""
+
+import os
+import re
+import gzip
+import json
+import time
+import random
+import hashlib
+import threading
+from collections import namedtuple
+from xml.etree import ElementTree
+from urllib.parse import urlparse, urlunparse, parse_qsl, urlencode
+
+import requests
+from requests.structures import CaseInsensitiveDict
+from selenium import webdriver
+from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+
+import sys
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))  # comun/ está en la carpeta raíz
+from comun.bloqueo_recursos import ResourceBlocker
+from comun.descarga import USER_AGENT, HostLimiter, get_session
+
+BACKENDS = ("http", "selenium")
+
+Page = namedtuple("Page", ["url", "status", "html", "headers", "via"])
+
+# Estados que suelen indicar un WAF/anti-bot que el navegador sí supera
+BROWSER_RETRY_STATUS = {403, 429, 500, 502, 503, 504}
+
+_NOISE_RE = re.compile(r'(?is)<(script|style|noscript|template)\b.*?</\1>')
+_TAG_RE = re.compile(r'(?s)<[^>]+>')
+_HEAD_END_RE = re.compile(rb'</head\s*>', re.I)
+_JS_HINT_RE = re.compile(
+    r'(?i)(enable|habilit\w*|activ\w*)\s+(el\s+)?javascript|javascript\s+(is\s+)?(required|disabled|deshabilitado)'
+)
+
+def jitter(a=0.6, b=1.2):
+    time.sleep(random.uniform(a, b))
+
+def needs_browser(html, min_text=300):
+    """
+    Heurística barata (sin parsear el DOM) para detectar páginas que dependen de JS:
+    - cuerpo vacío o con muy poco texto visible
+    - aviso explícito de habilitar JavaScript con poco contenido alrededor
+    """
+    if not html:
+        return True
+    visible = _TAG_RE.sub(" ", _NOISE_RE.sub(" ", html))
+    visible = re.sub(r'\s+', ' ', visible).strip()
+    if len(visible) < min_text:
+        return True
+    if _JS_HINT_RE.search(visible) and len(visible) < min_text * 4:
+        return True
+    return False
+
+def canonical_url(u):
+    """Clave estable: sin fragmento ni barra final, parámetros de query ordenados."""
+    try:
+        p = urlparse(u)
+        q = urlencode(sorted(parse_qsl(p.query, keep_blank_values=True)))
+        return urlunparse((p.scheme.lower(), p.netloc.lower(), p.path.rstrip('/') or '/', '', q, ''))
+    except Exception:
+        return u
+
+# -------------------------
+# HTTP (por defecto)
+# -------------------------
+class HttpFetcher:
+    def __init__(self, timeout=(10, 25), pool_size=8, retries=3):
+        self.timeout = timeout
+        self.session = get_session(pool_size=pool_size, retries=retries)
+
+    def fetch(self, url, stop_early=None, headers=None):
+        if stop_early is None:
+            r = self.session.get(url, timeout=self.timeout, headers=headers)
+            return Page(r.url, r.status_code, r.content.decode(self._encoding(r), "replace"),
+                        CaseInsensitiveDict(r.headers), "http")
+
+        with self.session.get(url, timeout=self.timeout, headers=headers, stream=True) as r:
+            headers = CaseInsensitiveDict(r.headers)
+            enc = self._encoding(r)
+            buf = b""
+            chunks = r.iter_content(chunk_size=8192)
+            for chunk in chunks:
+                start = max(0, len(buf) - 8)
+                buf += chunk
+                m = _HEAD_END_RE.search(buf, start)
+                if m:
+                    head = buf[:m.end()].decode(enc, "replace")
+                    if r.status_code < 400 and stop_early(head, headers):
+                        return Page(r.url, r.status_code, head, headers, "head")
+                    break
+            buf += b"".join(chunks)
+            return Page(r.url, r.status_code, buf.decode(enc, "replace"), headers, "http")
+
+    @staticmethod
+    def _encoding(r):
+        # Drupal sirve UTF-8; requests asume latin-1 si falta el charset
+        if not r.encoding or r.encoding.lower() == "iso-8859-1":
+            return "utf-8"
+        return r.encoding
+
+    def close(self):
+        self.session.close()
+
+# -------------------------
+# Sitemaps
+# -------------------------
+def _xml_tag(el):
+    return el.tag.rsplit("}", 1)[-1]
+
+def iter_sitemap(session, url, timeout=(10, 60), max_depth=3):
+    """
+    Genera (loc, lastmod) de un sitemap sin cargarlo entero en memoria: el XML se
+    parsea en streaming desde la respuesta y los sub-sitemaps de un índice
+    (<sitemapindex>, también .xml.gz) se recorren en orden. lastmod puede ser None.
+    """
+    children = []
+    with session.get(url, timeout=timeout, stream=True) as r:
+        if r.status_code >= 400:
+            print(f"[WARN] Sitemap {url}: HTTP {r.status_code}")
+            return
+        r.raw.decode_content = True  # Content-Encoding: gzip lo resuelve urllib3
+        stream = r.raw
+        ctype = r.headers.get("Content-Type", "")
+        if url.endswith(".gz") or "gzip" in ctype:
+            stream = gzip.GzipFile(fileobj=stream)
+        try:
+            for _, el in ElementTree.iterparse(stream, events=("end",)):
+                tag = _xml_tag(el)
+                if tag not in ("url", "sitemap"):
+                    continue
+                fields = {_xml_tag(c): (c.text or "").strip() for c in el}
+                el.clear()
+                if not fields.get("loc"):
+                    continue
+                if tag == "sitemap":
+                    children.append(fields["loc"])
+                else:
+                    yield fields["loc"], fields.get("lastmod") or None
+        except (ElementTree.ParseError, OSError, EOFError) as e:
+            print(f"[WARN] Sitemap {url} ilegible: {e}")
+    if max_depth > 0:
+        for child in children:
+            yield from iter_sitemap(session, child, timeout=timeout, max_depth=max_depth - 1)
+
+# -------------------------
+# Caché persistente de páginas
+# -------------------------
+class PageCache:
+    """
+    Caché en disco por URL canónica: <sha1>.html (cuerpo) + <sha1>.json (metadatos).
+    - Dentro del TTL la página se sirve sin red; pasado el TTL se revalida con
+      If-None-Match / If-Modified-Since y un 304 reutiliza el cuerpo guardado.
+    - Al superar max_mb se borran las entradas usadas hace más tiempo (LRU).
+    - Las descargas cortadas tras el <head> se guardan como parciales.
+    """
+    KEEP_HEADERS = ("ETag", "Last-Modified", "Content-Type")
+
+    def __init__(self, cache_dir=".fontur_cache", ttl_hours=24, max_mb=500):
+        self.cache_dir = cache_dir
+        self.ttl = float(ttl_hours) * 3600
+        self.max_bytes = int(float(max_mb) * 1024 * 1024)
+        self._index = {}  # clave -> [bytes, último uso]
+        self._total = 0
+        self._lock = threading.Lock()
+        os.makedirs(cache_dir, exist_ok=True)
+        self._load_index()
+
+    def _paths(self, key):
+        base = os.path.join(self.cache_dir, key)
+        return base + ".json", base + ".html"
+
+    @staticmethod
+    def key(url):
+        return hashlib.sha1(canonical_url(url).encode("utf-8")).hexdigest()
+
+    def _load_index(self):
+        for e in os.scandir(self.cache_dir):
+            if not e.name.endswith(".json"):
+                continue
+            key = e.name[:-5]
+            meta_path, html_path = self._paths(key)
+            try:
+                size = e.stat().st_size + os.path.getsize(html_path)
+            except OSError:
+                continue
+            self._index[key] = [size, e.stat().st_mtime]
+            self._total += size
+
+    def __len__(self):
+        return len(self._index)
+
+    def get(self, url):
+        """Entrada guardada (dict con html, headers, fresh, partial) o None."""
+        key = self.key(url)
+        with self._lock:
+            if key not in self._index:
+                return None
+            self._index[key][1] = time.time()
+        meta_path, html_path = self._paths(key)
+        try:
+            with open(meta_path, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+            with open(html_path, "r", encoding="utf-8") as f:
+                meta["html"] = f.read()
+            os.utime(meta_path)
+        except (OSError, ValueError):
+            return None
+        meta["headers"] = CaseInsensitiveDict(meta.get("headers") or {})
+        meta["fresh"] = time.time() - meta.get("stored_at", 0) < self.ttl
+        return meta
+
+    def validators(self, entry):
+        """Cabeceras para una petición condicional a partir de una entrada completa."""
+        h = {}
+        if entry["headers"].get("ETag"):
+            h["If-None-Match"] = entry["headers"]["ETag"]
+        if entry["headers"].get("Last-Modified"):
+            h["If-Modified-Since"] = entry["headers"]["Last-Modified"]
+        return h
+
+    def put(self, url, page, partial=False):
+        key = self.key(url)
+        meta_path, html_path = self._paths(key)
+        meta = {
+            "url": page.url or url,
+            "status": page.status,
+            "via": page.via,
+            "partial": bool(partial),
+            "stored_at": time.time(),
+            "headers": {k: page.headers[k] for k in self.KEEP_HEADERS if page.headers.get(k)},
+        }
+        body = page.html or ""
+        # Escritura atómica: archivo temporal + os.replace
+        tmp_html = f"{html_path}.{threading.get_ident()}.tmp"
+        tmp_meta = f"{meta_path}.{threading.get_ident()}.tmp"
+        with open(tmp_html, "w", encoding="utf-8") as f:
+            f.write(body)
+        with open(tmp_meta, "w", encoding="utf-8") as f:
+            json.dump(meta, f, ensure_ascii=False)
+        os.replace(tmp_html, html_path)
+        os.replace(tmp_meta, meta_path)
+
+        size = os.path.getsize(html_path) + os.path.getsize(meta_path)
+        with self._lock:
+            old = self._index.get(key)
+            if old:
+                self._total -= old[0]
+            self._index[key] = [size, time.time()]
+            self._total += size
+            self._evict()
+
+    def refresh(self, url):
+        """Tras un 304: la copia sigue vigente, se reinicia su TTL."""
+        meta_path, _ = self._paths(self.key(url))
+        try:
+            with open(meta_path, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+            meta["stored_at"] = time.time()
+            with open(meta_path, "w", encoding="utf-8") as f:
+                json.dump(meta, f, ensure_ascii=False)
+        except (OSError, ValueError):
+            pass
+
+    def _evict(self):
+        # Se llama con self._lock tomado
+        if self._total <= self.max_bytes:
+            return
+        for key, (size, _) in sorted(self._index.items(), key=lambda kv: kv[1][1]):
+            if self._total <= self.max_bytes:
+                break
+            for path in self._paths(key):
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+            self._total -= size
+            del self._index[key]
+
+# -------------------------
+# Navegador (respaldo)
+# -------------------------
+class BrowserFetcher:
+    def __init__(self, headless=True, wait_sec=12, block="medios"):
+        self.headless = headless
+        self.wait_sec = wait_sec
+        self.blocker = ResourceBlocker(block)
+        self.driver = None
+        self._cookies_done = False
+        self._lock = threading.Lock()
+
+    def _setup_driver(self):
+        chrome_options = Options()
+        if self.headless:
+            chrome_options.add_argument("--headless=new")
+        chrome_options.add_argument("--no-sandbox")
+        chrome_options.add_argument("--disable-dev-shm-usage")
+        chrome_options.add_argument("--disable-gpu")
+        chrome_options.add_argument("--window-size=1920,1080")
+        chrome_options.add_argument("--lang=es-ES")
+        chrome_options.add_argument(f"--user-agent={USER_AGENT}")
+        self.blocker.configure(chrome_options)
+        self.driver = webdriver.Chrome(options=chrome_options)
+        self.blocker.attach(self.driver)
+
+    def wait_for_page(self):
+        WebDriverWait(self.driver, self.wait_sec).until(
+            EC.presence_of_element_located((By.CSS_SELECTOR, "body"))
+        )
+
+    def try_accept_cookies(self):
+        try:
+            btn = self.driver.find_elements(By.ID, "onetrust-accept-btn-handler")
+            if btn:
+                btn[0].click()
+                jitter(0.2, 0.5)
+                return
+            for xp in [
+                "//button[contains(., 'Aceptar')]",
+                "//button[contains(., 'ACEPTAR')]",
+                "//button[contains(., 'Accept')]",
+                "//a[contains(., 'Aceptar')]",
+            ]:
+                els = self.driver.find_elements(By.XPATH, xp)
+                if els:
+                    els[0].click()
+                    jitter(0.2, 0.5)
+                    return
+        except Exception:
+            pass
+
+    def fetch(self, url):
+        with self._lock:
+            if self.driver is None:
+                self._setup_driver()
+            self.driver.get(url)
+            self.wait_for_page()
+            if not self._cookies_done:
+                self.try_accept_cookies()
+                self._cookies_done = True
+            jitter(0.6, 1.2)
+            stats = self.blocker.page_stats(self.driver)
+            if stats["bloqueadas"]:
+                print(f"[INFO] {url}: {ResourceBlocker.describe(stats)}")
+            return Page(self.driver.current_url, 200, self.driver.page_source, {}, "browser")
+
+    def close(self):
+        try:
+            if self.driver:
+                self.driver.quit()
+        except Exception:
+            pass
+        self.driver = None
+
+# -------------------------
+# HTTP primero, navegador como respaldo
+# -------------------------
+class HybridFetcher:
+    def __init__(self, backend="http", headless=True, wait_sec=12, pool_size=8, per_host=4,
+                 cache=None, offline=False, block="medios"):
+        if backend not in BACKENDS:
+            raise ValueError(f"Backend no soportado: {backend} (use {', '.join(BACKENDS)})")
+        if offline and cache is None:
+            raise ValueError("El modo offline necesita un PageCache")
+        self.backend = backend
+        self.http = HttpFetcher(pool_size=max(pool_size, per_host))
+        self.browser = BrowserFetcher(headless=headless, wait_sec=wait_sec, block=block)
+        self.limiter = HostLimiter(per_host=per_host)
+        self.cache = cache
+        self.offline = bool(offline)
+        self.stats = {"http": 0, "head": 0, "browser": 0, "fallback": 0, "errors": 0,
+                      "cache": 0, "revalidated": 0, "miss": 0}
+        self._stats_lock = threading.Lock()
+
+    def _count(self, key):
+        with self._stats_lock:
+            self.stats[key] += 1
+
+    def fetch(self, url, stop_early=None):
+        """
+        Devuelve un Page o None si la URL no pudo descargarse por ningún medio.
+        stop_early solo se aplica por HTTP (el navegador siempre carga la página completa).
+        Con caché: copia vigente (o modo offline) -> sin red; copia vencida -> GET condicional.
+        """
+        entry = self.cache.get(url) if self.cache is not None else None
+        if entry is not None:
+            usable = entry["fresh"] or self.offline
+            if entry["partial"]:
+                # Solo hay <head>: vale mientras siga justificando el corte
+                if usable and stop_early is not None and stop_early(entry["html"], entry["headers"]):
+                    self._count("cache")
+                    return Page(entry["url"], entry["status"], entry["html"], entry["headers"], "head")
+                entry = None
+            elif usable:
+                self._count("cache")
+                return Page(entry["url"], entry["status"], entry["html"], entry["headers"], "cache")
+        if self.offline:
+            self._count("miss")
+            return None
+
+        validators = self.cache.validators(entry) if entry is not None else None
+        page = self._fetch_network(url, stop_early, validators)
+        if page is not None and page.status == 304 and entry is not None:
+            self.cache.refresh(url)
+            self._count("revalidated")
+            return Page(entry["url"], entry["status"], entry["html"], entry["headers"], "cache")
+        if page is not None and self.cache is not None and page.status < 300:
+            self.cache.put(url, page, partial=(page.via == "head"))
+        return page
+
+    def _fetch_network(self, url, stop_early=None, validators=None):
+        if self.backend == "http":
+            try:
+                with self.limiter.slot(url):
+                    page = self.http.fetch(url, stop_early=stop_early, headers=validators)
+            except requests.RequestException:
+                page = None
+            if page is not None and page.status == 304:
+                return page
+            if page is not None and page.via == "head":
+                self._count("head")
+                return page
+            if page is not None and page.status < 400 and not needs_browser(page.html):
+                self._count("http")
+                return page
+            if page is not None and page.status >= 400 and page.status not in BROWSER_RETRY_STATUS:
+                # 404/410 y similares: el navegador recibiría lo mismo
+                self._count("errors")
+                return None
+            self._count("fallback")
+        try:
+            page = self.browser.fetch(url)
+        except Exception:
+            self._count("errors")
+            return None
+        self._count("browser")
+        return page
+
+    def close(self):
+        self.http.close()
+        self.browser.close()
@@ -3,20 +3,61 @@ from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from bs4 import BeautifulSoup
-from urllib.parse import urljoin, urlparse, urlunparse, parse_qs, urlencode
-from collections import deque
+from urllib.parse import urljoin, urlparse, urlunparse, parse_qs, urlencode, unquote
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 import unicodedata
+import heapq, itertools, hashlib
+from fnmatch import fnmatchcase
 import json, csv, re, time, random
 from datetime import datetime
 
+import os
+import sys
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))  # comun/ está en la carpeta raíz
+from comun.bloqueo_recursos import ResourceBlocker
+from comun.espera_carga import ReadyWaiter
+from fontur_fetch import HybridFetcher, iter_sitemap
+from comun.parseo_html import make_soup
+
+# Rutas que son claramente contenido de Fontur (nodo, noticia, proyecto...)
+CONTENT_PATH_RE = re.compile(r'/es/(node|noticias|proyectos|convocatorias|destinos)/')
+
 def slugify_text(s: str) -> str:
     if not s: return ""
     s = unicodedata.normalize('NFKD', s)
     s = ''.join(ch for ch in s if not unicodedata.combining(ch))
     return s.lower()
 
+# Reglas por sitio (host sin "www.") para la clave de crawl (crawl_key), no para el 'enlace' guardado:
+# - allow: únicos parámetros que se conservan (None = todos menos los de deny)
+# - deny: parámetros que se quitan (comodines fnmatch)
+# - collapse: (regex, reemplazo) sobre la ruta (solo lo que no cambia la página: sesión)
+# - templates: (regex, reemplazo) sobre la ruta al armar la plantilla de TrapDetector (url_template):
+#   todas las vistas de calendario/agenda caen en una plantilla y se limitan como trampa
+# Facetas, orden y sesiones generan URLs distintas para el mismo contenido.
+CANON_DENY_DEFAULT = ["utm_*", "fbclid", "gclid", "_ga", "mc_*", "sid", "sessionid", "phpsessid",
+                      "jsessionid", "session", "token", "ref", "share", "destination"]
+CANON_RULES = {
+    "fontur.com.co": {
+        "allow": {"keys", "page"},
+        "deny": [],
+        "collapse": [(r";jsessionid=[^/]*", "")],
+        "templates": [(r"/(?:calendar|calendario|agenda)/.*", "/calendario/*")],
+    },
+    "colombia.travel": {
+        "allow": None,
+        "deny": ["f[*", "f", "sort_*", "order", "items_per_page", "view_mode"],
+        "collapse": [],
+        "templates": [],
+    },
+}
+
+def _canon_rules(host):
+    host = host.lower().split(":")[0]
+    return CANON_RULES.get(host[4:] if host.startswith("www.") else host)
+
 def canon_url(u: str) -> str:
+    """URL de salida ('enlace' y clave de ResultStore): sin fragmento y con la query ordenada."""
     try:
         p = urlparse(u)
         # quitar fragmentos y normalizar query (ordenar)
@@ -26,9 +67,155 @@ def canon_url(u: str) -> str:
     except:
         return u
 
+def crawl_key(u: str) -> str:
+    """Clave de visitadas/frontera/trampas: canon_url más las reglas del sitio (CANON_RULES)."""
+    try:
+        p = urlparse(u)
+        path = p.path
+        rules = _canon_rules(p.netloc)
+        deny = CANON_DENY_DEFAULT + (rules["deny"] if rules else [])
+        if rules:
+            for pat, repl in rules["collapse"]:
+                path = re.sub(pat, repl, path)
+        # quitar fragmentos, parámetros de sesión/seguimiento y normalizar query (ordenar)
+        q = parse_qs(p.query, keep_blank_values=True)
+        keep = []
+        for k, v in q.items():
+            if rules and rules["allow"] is not None and k not in rules["allow"]: continue
+            if any(fnmatchcase(k.lower(), pat) for pat in deny): continue
+            v = v if isinstance(v, str) else v[0]
+            if k == "page" and v in ("", "0"): continue  # page=0 es la primera página
+            keep.append((k, v))
+        return urlunparse((p.scheme, p.netloc, path.rstrip('/'), '', urlencode(sorted(keep)), ''))
+    except:
+        return u
+
+def url_template(u: str) -> str:
+    """Plantilla de ruta: números e identificadores largos como comodín, solo nombres de parámetros."""
+    p = urlparse(u)
+    path = p.path
+    rules = _canon_rules(p.netloc)
+    for pat, repl in (rules["templates"] if rules else []):
+        path = re.sub(pat, repl, path)
+    segs = []
+    for seg in path.strip('/').split('/'):
+        seg = re.sub(r'\d+', '{n}', seg)
+        if len(seg) > 24 and re.fullmatch(r'[0-9a-f{}n-]+', seg): seg = '{id}'
+        segs.append(seg)
+    params = ",".join(sorted(parse_qs(p.query, keep_blank_values=True)))
+    return f"{p.netloc}/{'/'.join(segs)}" + (f"?{params}" if params else "")
+
+class TrapDetector:
+    """
+    Trampas de crawl (espacios de URLs casi infinitos: calendarios, facetas, paginadores):
+    - rutas con segmentos repetidos o demasiado profundas se descartan de entrada
+    - una plantilla de ruta (url_template) con más de max_per_template URLs en la frontera
+      (salvo rutas de contenido sin query, content_re: /es/node/{n} es contenido real)
+    - o cuyas páginas descargadas repiten contenido (hash del texto sin números)
+    Las plantillas atrapadas quedan en lista negra hasta el final de la corrida.
+    """
+    def __init__(self, max_per_template=60, min_pages=6, dup_ratio=0.5, max_segments=10, content_re=None):
+        self.content_re = content_re
+        self.max_per_template = max_per_template
+        self.min_pages = min_pages
+        self.dup_ratio = dup_ratio
+        self.max_segments = max_segments
+        self.urls = {}      # plantilla -> URLs distintas vistas en la frontera
+        self.pages = {}     # plantilla -> [descargadas, repetidas]
+        self.hashes = set()
+        self.blacklist = {}  # plantilla -> motivo
+        self.descartadas = 0
+
+    def _trap(self, tpl, motivo):
+        if tpl not in self.blacklist:
+            self.blacklist[tpl] = motivo
+            print(f"🪤 Trampa: {tpl} ({motivo})")
+
+    def allow(self, url):
+        """Registra una URL candidata a la frontera; False si cae en una trampa."""
+        tpl = url_template(url)
+        if tpl not in self.blacklist:
+            segs = [s for s in urlparse(url).path.split('/') if s]
+            if len(segs) > self.max_segments:
+                self._trap(tpl, f"{len(segs)} segmentos")
+            elif len(segs) - len(set(segs)) >= 2:
+                self._trap(tpl, "segmentos repetidos")
+            elif not (self.content_re and self.content_re.search(url) and not urlparse(url).query):
+                seen = self.urls.setdefault(tpl, set())
+                seen.add(url)
+                if len(seen) > self.max_per_template:
+                    self._trap(tpl, f"más de {self.max_per_template} URLs")
+        if tpl in self.blacklist:
+            self.descartadas += 1
+            return False
+        return True
+
+    def blocked(self, url):
+        return url_template(url) in self.blacklist
+
+    def page(self, url, text):
+        """Registra el contenido descargado; las plantillas que solo repiten páginas se bloquean."""
+        tpl = url_template(url)
+        norm = " ".join(re.sub(r'\d+', '', slugify_text(text)).split())
+        digest = hashlib.sha1(norm.encode("utf-8")).hexdigest()
+        st = self.pages.setdefault(tpl, [0, 0])
+        st[0] += 1
+        if digest in self.hashes: st[1] += 1
+        else: self.hashes.add(digest)
+        if st[0] >= self.min_pages and st[1] / st[0] >= self.dup_ratio:
+            self._trap(tpl, f"{st[1]}/{st[0]} páginas repetidas")
+
+    def summary(self):
+        if not self.blacklist: return None
+        return (f"{len(self.blacklist)} plantillas en lista negra, {self.descartadas} URLs descartadas: "
+                + "; ".join(f"{t} ({m})" for t, m in list(self.blacklist.items())[:5]))
+
+class InterestMatcher:
+    """
+    Términos del departamento y sus municipios compilados una sola vez en una alternancia
+    sobre texto sin tildes y en minúsculas (mismo criterio de subcadena que antes).
+    """
+    def __init__(self, keywords, municipios):
+        self.display = {}       # término normalizado -> nombre con tildes para mostrar
+        self.municipios = set()
+        terms = {slugify_text(k) for k in keywords}
+        for m in municipios:
+            key = slugify_text(m)
+            terms.add(key); self.municipios.add(key)
+            if key not in self.display or not m.isascii(): self.display[key] = m
+        terms.discard("")
+        # los más largos primero: en un mismo punto gana "san agustin" sobre "agustin"
+        self.regex = re.compile("|".join(re.escape(t) for t in sorted(terms, key=len, reverse=True)))
+
+    def find(self, text):
+        """Términos encontrados (normalizados, sin repetir, en orden de aparición)."""
+        return list(dict.fromkeys(self.regex.findall(slugify_text(text))))
+
+class ResultStore:
+    """Resultados indexados por canon_url: pertenencia O(1) y orden de inserción."""
+    def __init__(self):
+        self._by_url = {}
+
+    def add(self, row) -> bool:
+        key = canon_url(row['enlace'])
+        if key in self._by_url: return False
+        self._by_url[key] = row
+        return True
+
+    def __contains__(self, url):
+        return canon_url(url) in self._by_url
+
+    def __iter__(self):
+        return iter(self._by_url.values())
+
+    def __len__(self):
+        return len(self._by_url)
+
 class FonturDeptScraper:
     def __init__(self, departamento: str, headless=True,
-                 max_pages=20, deep_crawl=True, max_depth=2, max_urls=800):
+                 max_pages=20, deep_crawl=True, max_depth=2, max_urls=800, block="medios",
+                 crawl_workers=4, per_host=2, crawl_delay=0.3,
+                 discovery="busqueda", sitemap_url=None, since=None, quiet_ms=500):
         self.departamento = departamento
         self.depto_norm = slugify_text(departamento)
         self.headless = headless
@@ -36,11 +223,30 @@ class FonturDeptScraper:
         self.deep_crawl = deep_crawl
         self.max_depth = max_depth
         self.max_urls = max_urls
+        # Deep crawl por HTTP: hilos, tope por host y pausa de cortesía por descarga
+        self.crawl_workers = max(1, int(crawl_workers))
+        self.per_host = max(1, int(per_host))
+        self.crawl_delay = float(crawl_delay)
+        self.crawl_stats = {"paginas": 0, "errores": 0, "items": 0, "relevantes": 0}
+        self.traps = TrapDetector(content_re=CONTENT_PATH_RE)  # calendarios/facetas/paginadores infinitos
 
         self.base = "https://www.fontur.com.co"
         self.visited = set()
-        self.results = []
+        self.results = ResultStore()
+        # Consultas equivalentes (misma clave normalizada) se resuelven una sola vez
+        self.query_cache = {}  # clave de consulta -> filas recogidas en todas sus páginas
+        self.query_stats = {}  # etiqueta -> {"paginas", "tarjetas", "nuevos", "equivalentes"}
         self.driver = None
+        self.fetcher = None  # HybridFetcher (deep crawl / sitemap)
+        # Descubrimiento: "busqueda" (Drupal + secciones + municipios + crawl) o "sitemap"
+        if discovery not in ("busqueda", "sitemap"):
+            raise ValueError(f"Modo de descubrimiento no soportado: {discovery}")
+        self.discovery = discovery
+        self.sitemap_url = sitemap_url or f"{self.base}/sitemap.xml"
+        self.since = datetime.strptime(since, "%Y-%m-%d").date() if since else None  # filtro por lastmod
+        self.sitemap_stats = {"urls": 0, "candidatas": 0, "descargadas": 0, "relevantes": 0}
+        self.blocker = ResourceBlocker(block)  # imágenes/fuentes/video/trackers no se descargan
+        self.ready = ReadyWaiter(quiet_ms=quiet_ms)  # espera por calma del DOM, no pausas fijas
 
         self.sections = [
             "/es/proyectos", "/es/convocatorias", "/es/noticias",
@@ -49,8 +255,11 @@ class FonturDeptScraper:
 
         # Variantes por departamento (tildes, sin tildes y siglas/atractivos típicos)
         self.keyword_variants, self.municipios = self._variants_for_depto(departamento)
+        self.matcher = InterestMatcher(self.keyword_variants, self.municipios)
 
-        self._setup_driver()
+        # En modo sitemap todo va por HTTP: Chrome solo se abre si hay que volver a la búsqueda
+        if self.discovery == "busqueda":
+            self._setup_driver()
 
     def _setup_driver(self):
         o = Options()
@@ -59,7 +268,9 @@ class FonturDeptScraper:
         o.add_argument("--disable-gpu"); o.add_argument("--window-size=1920,1080")
         o.add_argument("--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36")
         o.add_experimental_option('excludeSwitches', ['enable-logging'])
+        self.blocker.configure(o)
         self.driver = webdriver.Chrome(options=o)
+        self.blocker.attach(self.driver)
 
     # ---------- Config ----------
     def _variants_for_depto(self, d):
@@ -82,19 +293,18 @@ class FonturDeptScraper:
                     "Cartagena del Chaira","Belén de los Andaquíes","Belen de los Andaquies","La Montañita",
                     "Curillo","Morelia","Milán","Milan","Solano","Valparaíso","Valparaiso","Chiribiquete",
                     "Cueva de los Guácharos","Río Orteguaza","Rio Orteguaza"]
-        # incluir variantes normalizadas de municipios
-        muni_norm = list({m for m in muni} | {slugify_text(m) for m in muni})
+        # incluir variantes normalizadas de municipios (orden estable: el de la lista)
+        muni_norm = list(dict.fromkeys(muni + [slugify_text(m) for m in muni]))
         return list(variants), muni_norm
 
     # ---------- Utilidades ----------
     def _open(self, url, wait_css="body", wait_sec=25):
         try:
-            cu = canon_url(url)
-            if cu in self.visited: return False
-            self.driver.get(url)
-            WebDriverWait(self.driver, wait_sec).until(EC.presence_of_element_located((By.CSS_SELECTOR, wait_css)))
-            time.sleep(random.uniform(1.8, 3.2))
-            self.visited.add(cu)
+            key = crawl_key(url)
+            if key in self.visited: return False
+            self.ready.load(self.driver, url, wait_css, selector_timeout=wait_sec)
+            self.visited.add(key)
+            self.blocker.page_stats(self.driver)
             return True
         except Exception as e:
             print(f"❌ Navegación fallida: {url} -> {e}")
@@ -114,26 +324,20 @@ class FonturDeptScraper:
 
     def _scroll_to_bottom(self):
         try:
-            last_h = 0
             for _ in range(3):
-                self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-                time.sleep(1.2)
-                h = self.driver.execute_script("return document.body.scrollHeight;")
-                if h == last_h: break
-                last_h = h
+                reg = self.ready.scroll(self.driver, self.driver.current_url, timeout=4, espera_fija=1.2)
+                if reg["crecio"] is False: break  # la página no trajo más contenido
         except: pass
 
     def _soup(self):
-        return BeautifulSoup(self.driver.page_source, 'html.parser')
+        return make_soup(self.driver.page_source)
 
     def _textnorm(self, s):
         return slugify_text(s or "")
 
     def _match_interest(self, text):
-        t = self._textnorm(text)
-        if any(k in t for k in [self._textnorm(v) for v in self.keyword_variants]): return True
-        if any(m in t for m in [self._textnorm(v) for v in self.municipios]): return True
-        return False
+        # lista de términos encontrados (vacía = sin interés)
+        return self.matcher.find(text)
 
     # ---------- Extracción ----------
     def _extract_items_from_listing(self, soup):
@@ -215,12 +419,33 @@ class FonturDeptScraper:
         return 'informacion_turistica'
 
     def _guess_location(self, text):
-        if self._match_interest(text): return self.departamento
+        for term in self._match_interest(text):
+            if term in self.matcher.municipios: return self.matcher.display[term]
         return self.departamento  # default
 
     # ---------- Flujo principal ----------
-    def search_and_collect(self, search_url):
+    def _query_key(self, search_url):
+        """Clave de una búsqueda: keys sin tildes/mayúsculas ("Garzón" == "garzon"), o la URL canónica."""
+        p = urlparse(search_url)
+        keys = parse_qs(p.query).get("keys")
+        if not keys: return crawl_key(search_url)
+        return f"{p.path.rstrip('/')}?keys={' '.join(slugify_text(keys[0]).split())}"
+
+    def search_and_collect(self, search_url, label=None):
+        """
+        Recorre una búsqueda/listado paginado. Una consulta equivalente a otra ya hecha se
+        sirve del caché sin abrir el navegador, y la paginación se corta en cuanto una página
+        no aporta URLs canónicas nuevas.
+        """
+        key = self._query_key(search_url)
+        stats = self.query_stats.setdefault(label or key, {"paginas": 0, "tarjetas": 0, "nuevos": 0, "equivalentes": []})
+        if key in self.query_cache:
+            nuevos = sum(1 for data in self.query_cache[key] if self.results.add(data))
+            stats["nuevos"] += nuevos
+            print(f"♻️ Consulta equivalente ya recorrida ({key}): +{nuevos} desde caché")
+            return
         if not self._open(search_url): return
+        rows = self.query_cache[key] = []
         self._accept_cookies(); self._scroll_to_bottom()
         page = 0; seen_any = False
         while page < self.max_pages:
@@ -230,10 +455,13 @@ class FonturDeptScraper:
             for c in cards:
                 data = self._extract_card(c)
                 if not data: continue
-                if canon_url(data['enlace']) in {r['enlace'] for r in self.results}: continue
-                self.results.append(data); collected += 1
+                rows.append(data)
+                if self.results.add(data): collected += 1
+            stats["paginas"] += 1; stats["tarjetas"] += len(cards); stats["nuevos"] += collected
             print(f"📄 Página {page+1}: +{collected} / total {len(self.results)}")
-            seen_any = seen_any or (collected > 0)
+            seen_any = seen_any or bool(cards)
+            if not collected:
+                break  # nada nuevo en esta página: las siguientes rara vez aportan
 
             # intentar botón siguiente
             if self._click_next(): 
@@ -283,75 +511,236 @@ class FonturDeptScraper:
         except: pass
         return False
 
+    def _link_score(self, text, url, depth):
+        """Prioridad en la frontera: coincidencias en el ancla y en la URL, menos la profundidad."""
+        score = 0
+        if self._match_interest(text): score += 3
+        if self._match_interest(unquote(urlparse(url).path).replace('-', ' ')): score += 2
+        if CONTENT_PATH_RE.search(url): score += 1
+        return score - depth
+
+    def _crawl_fetch(self, url):
+        # Corre en los hilos del crawl: HTTP con tope por host (Chrome solo como respaldo)
+        try:
+            page = self.fetcher.fetch(url)
+        except Exception as e:
+            print(f"❌ Descarga fallida: {url} -> {e}")
+            return None
+        time.sleep(random.uniform(self.crawl_delay, 2 * self.crawl_delay))
+        return make_soup(page.html) if page else None
+
+    def _crawl_page(self, soup, depth, push):
+        base_host = urlparse(self.base).netloc
+        for a in soup.select('a[href]'):
+            href = a.get('href')
+            if not href: continue
+            full = urljoin(self.base, href)
+            if urlparse(full).netloc != base_host: continue
+            cu, key = canon_url(full), crawl_key(full)
+            if self.traps.blocked(key): continue
+            text = a.get_text(" ", strip=True)
+            # si coincide con intereses, o es claramente contenido de Fontur (nodo, noticia, proyecto)
+            if not (self._match_interest(text) or CONTENT_PATH_RE.search(cu)): continue
+            # extraer tarjeta si parece contenido
+            par = a.find_parent(['article','div','li','section'])
+            data = None
+            if par: data = self._extract_card(par)
+            if not data:
+                # como fallback, crear mínima si es detalle
+                title = a.get_text(strip=True) or cu.split('/')[-1].replace('-', ' ')
+                data = {
+                    'titulo': title[:300],
+                    'categoria': self._guess_category(title),
+                    'descripcion': "Contenido interno de Fontur",
+                    'enlace': cu,
+                    'imagen': "",
+                    'ubicacion': self.departamento,
+                    'tipo': 'detalle',
+                    'fecha_extraccion': datetime.now().isoformat(),
+                    'precio': 'Consultar',
+                    'telefono': '',
+                    'detalles': '',
+                    'fuente': 'Fontur'
+                }
+            if self.results.add(data):
+                self.crawl_stats["items"] += 1
+                if self._match_interest(data['titulo'] + " " + data['descripcion']):
+                    self.crawl_stats["relevantes"] += 1
+            # expandir frontera
+            if depth + 1 <= self.max_depth and self.traps.allow(key):
+                push(cu, depth + 1, self._link_score(text, cu, depth + 1))
+
     def _deep_crawl_domain(self):
+        """
+        Crawl con frontera por prioridad (_link_score): primero los enlaces que mencionan el
+        departamento/municipios, a menor profundidad. Descarga en paralelo (crawl_workers)
+        con HybridFetcher y su tope por host; respeta max_depth y max_urls.
+        """
         if not self.deep_crawl: return
-        q = deque()
-        seed_links = [r['enlace'] for r in self.results][:120]  # semillas de resultados
-        for link in seed_links:
-            q.append((link, 0))
-        crawled = 0
-        while q and crawled < self.max_urls:
-            url, depth = q.popleft()
-            if depth > self.max_depth: continue
-            if not self._open(url): continue
-            self._scroll_to_bottom()
-            soup = self._soup()
-            # recoger enlaces internos
-            for a in soup.select('a[href]'):
-                href = a.get('href'); 
-                if not href: continue
-                full = urljoin(self.base, href)
-                if urlparse(full).netloc != urlparse(self.base).netloc: continue
-                cu = canon_url(full)
-                # si coincide con intereses, o es claramente contenido de Fontur (nodo, noticia, proyecto)
-                if self._match_interest(a.get_text(" ", strip=True)) or re.search(r'/es/(node|noticias|proyectos|convocatorias|destinos)/', cu):
-                    # extraer tarjeta si parece contenido
-                    par = a.find_parent(['article','div','li','section'])
-                    data = None
-                    if par: data = self._extract_card(par)
-                    if not data:
-                        # como fallback, crear mínima si es detalle
-                        title = a.get_text(strip=True) or cu.split('/')[-1].replace('-', ' ')
-                        data = {
-                            'titulo': title[:300],
-                            'categoria': self._guess_category(title),
-                            'descripcion': "Contenido interno de Fontur",
-                            'enlace': cu,
-                            'imagen': "",
-                            'ubicacion': self.departamento,
-                            'tipo': 'detalle',
-                            'fecha_extraccion': datetime.now().isoformat(),
-                            'precio': 'Consultar',
-                            'telefono': '',
-                            'detalles': '',
-                            'fuente': 'Fontur'
-                        }
-                    if data and data['enlace'] not in {r['enlace'] for r in self.results}:
-                        self.results.append(data)
-                    # expandir cola
-                    if cu not in self.visited:
-                        q.append((cu, depth+1))
-            crawled += 1
+        frontier, seq, queued = [], itertools.count(), set()
+        def push(url, depth, score):
+            key = crawl_key(url)
+            if key in queued or key in self.visited: return
+            queued.add(key)
+            heapq.heappush(frontier, (-score, next(seq), url, depth))
+        for link in [r['enlace'] for r in self.results][:120]:  # semillas de resultados
+            push(link, 0, self._link_score("", link, 0))
+
+        stats = self.crawl_stats
+        antes = len(self.results)
+        t0 = time.time()
+        self._ensure_fetcher()
+        in_flight = {}
+        with ThreadPoolExecutor(max_workers=self.crawl_workers) as pool:
+            while frontier or in_flight:
+                while frontier and len(in_flight) < self.crawl_workers \
+                        and stats["paginas"] + stats["errores"] + len(in_flight) < self.max_urls:
+                    _, _, url, depth = heapq.heappop(frontier)
+                    key = crawl_key(url)
+                    if key in self.visited: continue
+                    if self.traps.blocked(key):  # atrapada después de entrar a la frontera
+                        self.traps.descartadas += 1
+                        continue
+                    self.visited.add(key)
+                    in_flight[pool.submit(self._crawl_fetch, url)] = (url, depth)
+                if not in_flight: break
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for fut in done:
+                    url, depth = in_flight.pop(fut)
+                    soup = fut.result()
+                    if soup is None:
+                        stats["errores"] += 1
+                        continue
+                    stats["paginas"] += 1
+                    self.traps.page(crawl_key(url), (soup.find("main") or soup.body or soup).get_text(" ", strip=True))
+                    self._crawl_page(soup, depth, push)
+        mins = max(time.time() - t0, 1e-6) / 60
+        print(f"🕸️ Deep crawl: {stats['paginas']} páginas ({stats['errores']} fallidas), "
+              f"+{len(self.results) - antes} resultados, {stats['relevantes']} relevantes "
+              f"({self._crawl_yield():.2f}/página, {stats['relevantes'] / mins:.0f}/min)")
+
+    def _ensure_fetcher(self):
+        if self.fetcher is None:
+            self.fetcher = HybridFetcher(backend="http", headless=self.headless,
+                                         pool_size=self.crawl_workers, per_host=self.per_host)
+        return self.fetcher
+
+    def _crawl_yield(self):
+        return self.crawl_stats["relevantes"] / max(self.crawl_stats["paginas"], 1)
+
+    # ---------- Descubrimiento por sitemap ----------
+    def _lastmod_ok(self, lastmod):
+        # Sin --since o sin lastmod se conserva la URL (no hay cómo descartarla)
+        if not self.since or not lastmod: return True
+        try:
+            return datetime.fromisoformat(lastmod.replace("Z", "+00:00")).date() >= self.since
+        except ValueError:
+            return True
+
+    def _extract_page(self, url, soup):
+        """Ficha mínima de una página de contenido (mismos campos que _extract_card)."""
+        def meta(*names):
+            for n in names:
+                m = soup.find("meta", attrs={"property": n}) or soup.find("meta", attrs={"name": n})
+                if m and m.get("content"): return m["content"].strip()
+            return ""
+        h1 = soup.find("h1")
+        title = (h1.get_text(" ", strip=True) if h1 else "") or meta("og:title") \
+            or (soup.title.get_text(strip=True) if soup.title else "")
+        main = soup.find("main") or soup.find("article") or soup.body or soup
+        p = main.find("p")
+        desc = meta("description", "og:description") or (p.get_text(" ", strip=True) if p else "")
+        body = main.get_text(" ", strip=True)
+        img = meta("og:image")
+        return {
+            'titulo': title[:300],
+            'categoria': self._guess_category(title + " " + desc + " " + url),
+            'descripcion': desc[:300] if desc else "Información turística disponible en Fontur",
+            'enlace': canon_url(url),
+            'imagen': urljoin(url, img) if img else "",
+            'ubicacion': self._guess_location(title + " " + desc + " " + body),
+            'tipo': 'detalle',
+            'fecha_extraccion': datetime.now().isoformat(),
+            'precio': 'Consultar',
+            'telefono': '',
+            'detalles': '',
+            'fuente': 'Fontur'
+        }, body
+
+    def _sitemap_discover(self):
+        """
+        Descubrimiento sin búsquedas ni paginación: recorre el sitemap (en streaming), deja
+        las URLs de secciones de contenido con lastmod >= since, las ordena por _link_score
+        y descarga por HTTP en paralelo (crawl_workers) hasta max_urls. Solo se guardan las
+        páginas cuyo texto menciona el departamento o sus municipios.
+        Devuelve el número de candidatas (0 = sitemap vacío o inaccesible).
+        """
+        stats = self.sitemap_stats
+        section_re = re.compile("|".join(re.escape(s) for s in self.sections))
+        fetcher = self._ensure_fetcher()
+        t0 = time.time()
+        candidates = []
+        try:
+            for loc, lastmod in iter_sitemap(fetcher.http.session, self.sitemap_url):
+                stats["urls"] += 1
+                url, key = canon_url(loc), crawl_key(loc)
+                if key in self.visited or url in self.results: continue
+                if not (section_re.search(url) or CONTENT_PATH_RE.search(url)): continue
+                if not self._lastmod_ok(lastmod): continue
+                self.visited.add(key)
+                candidates.append(url)
+        except Exception as e:
+            print(f"⚠️ Sitemap no disponible ({self.sitemap_url}): {e}")
+        stats["candidatas"] = len(candidates)
+        print(f"🗺️ Sitemap: {stats['urls']} URLs, {len(candidates)} candidatas"
+              + (f" (lastmod >= {self.since})" if self.since else ""))
+        if not candidates: return 0
+
+        candidates.sort(key=lambda u: self._link_score("", u, 0), reverse=True)
+        candidates = candidates[:self.max_urls]
+        with ThreadPoolExecutor(max_workers=self.crawl_workers) as pool:
+            for url, soup in zip(candidates, pool.map(self._crawl_fetch, candidates)):
+                if soup is None: continue
+                stats["descargadas"] += 1
+                data, body = self._extract_page(url, soup)
+                if not self._match_interest(data['titulo'] + " " + data['descripcion'] + " " + body):
+                    continue
+                if self.results.add(data):
+                    stats["relevantes"] += 1
+        mins = max(time.time() - t0, 1e-6) / 60
+        print(f"🗺️ Sitemap: {stats['descargadas']} páginas descargadas, {stats['relevantes']} relevantes "
+              f"({stats['relevantes'] / max(stats['descargadas'], 1):.2f}/página, "
+              f"{stats['descargadas'] / mins:.0f} páginas/min)")
+        return len(candidates)
 
     def _explore_sections(self):
         for s in self.sections:
             self.search_and_collect(urljoin(self.base, s))
 
     def _municipality_queries(self):
-        # lanza búsquedas por cada municipio/atractivo
-        for m in self.municipios[:40]:
-            key = m if " " not in m else m.replace(" ", "+")
-            url = f"{self.base}/es/search/node?keys={key}"
-            self.search_and_collect(url)
+        # una búsqueda por municipio/atractivo: las variantes con y sin tildes van juntas
+        grupos = {}
+        for m in self.municipios:
+            grupos.setdefault(slugify_text(m), []).append(m)
+        for key, variantes in list(grupos.items())[:40]:
+            nombre = self.matcher.display.get(key, variantes[0])
+            url = f"{self.base}/es/search/node?keys={nombre.replace(' ', '+')}"
+            self.search_and_collect(url, label=f"municipio: {nombre}")
+            self.query_stats[f"municipio: {nombre}"]["equivalentes"] = [v for v in variantes if v != nombre]
+
+    def _query_report(self):
+        """Rendimiento por consulta: qué variantes aportan resultados nuevos y cuáles sobran."""
+        if not self.query_stats: return
+        print("🔎 Rendimiento por consulta (nuevos / tarjetas vistas / páginas):")
+        for label, st in sorted(self.query_stats.items(), key=lambda kv: -kv[1]["nuevos"]):
+            eq = f"  (cubre: {', '.join(st['equivalentes'])})" if st["equivalentes"] else ""
+            marca = "" if st["nuevos"] else "  ← sin aporte"
+            print(f" - {label}: {st['nuevos']} / {st['tarjetas']} / {st['paginas']}{eq}{marca}")
 
     # ---------- Salida ----------
     def _unique(self):
-        uniq, seen = [], set()
-        for r in self.results:
-            cu = canon_url(r['enlace'])
-            if cu not in seen:
-                seen.add(cu); uniq.append(r)
-        return uniq
+        # ResultStore ya deduplica por canon_url al insertar
+        return list(self.results)
 
     def save(self, tag=None):
         data = self._unique()
@@ -373,37 +762,62 @@ class FonturDeptScraper:
         for k,v in sorted(by_cat.items(), key=lambda x: x[1], reverse=True):
             print(f" - {k}: {v}")
         print(f"TOTAL: {len(data)}")
+        self._query_report()
+        if self.sitemap_stats["descargadas"]:
+            print(f"🗺️ Sitemap: {self.sitemap_stats['relevantes']} relevantes en "
+                  f"{self.sitemap_stats['descargadas']} páginas de {self.sitemap_stats['candidatas']} candidatas")
+        if self.crawl_stats["paginas"]:
+            print(f"🕸️ Rendimiento del crawl: {self.crawl_stats['relevantes']} relevantes en "
+                  f"{self.crawl_stats['paginas']} páginas ({self._crawl_yield():.2f}/página)")
+        trampas = self.traps.summary()
+        if trampas: print(f"🪤 {trampas}")
+        bloqueo = self.blocker.summary()
+        if bloqueo: print(f"🧱 {bloqueo}")
+        espera = self.ready.summary()
+        if espera: print(f"⏱️ {espera}")
         print("="*60)
 
     # ---------- Pipeline ----------
     def run(self):
         print(f"🚀 FonturScraper — Departamento: {self.departamento}")
-        # 1) búsqueda principal (palabra clave + variantes)
-        seed_queries = [
-            f"{self.base}/es/search/node?keys={self.departamento}",
-        ] + [f"{self.base}/es/search/node?keys={v}" for v in self.keyword_variants]
-        for q in seed_queries:
-            self.search_and_collect(q)
-
-        # 2) secciones
-        self._explore_sections()
-
-        # 3) municipios / atractivos
-        self._municipality_queries()
-
-        # 4) deep crawl (opcional)
-        self._deep_crawl_domain()
+        search = True
+        if self.discovery == "sitemap":
+            # 0) sitemap: reemplaza búsquedas, secciones y crawl; si no hay sitemap se vuelve a buscar
+            search = not self._sitemap_discover()
+            if search:
+                print("⚠️ Sin URLs en el sitemap: se usa la búsqueda del sitio")
+                if self.driver is None: self._setup_driver()
+
+        if search:
+            # 1) búsqueda principal (palabra clave + variantes)
+            seed_queries = [
+                f"{self.base}/es/search/node?keys={self.departamento}",
+            ] + [f"{self.base}/es/search/node?keys={v}" for v in self.keyword_variants]
+            for q in seed_queries:
+                self.search_and_collect(q)
+
+            # 2) secciones
+            self._explore_sections()
+
+            # 3) municipios / atractivos
+            self._municipality_queries()
+
+            # 4) deep crawl (opcional)
+            self._deep_crawl_domain()
 
         # 5) salida
         self.report()
         self.save()
 
-        self.driver.quit()
-        print("👋 Navegador cerrado")
+        if self.fetcher: self.fetcher.close()
+        if self.driver:
+            self.driver.quit()
+            print("👋 Navegador cerrado")
 
 # ----------------- Ejecutar -----------------
 if __name__ == "__main__":
-    # Cambia aquí el departamento objetivo:
+    # Cambia aquí el departamento objetivo (discovery="sitemap", since="2024-01-01" para
+    # descubrir por sitemap.xml sin abrir Chrome):
     scraper = FonturDeptScraper(departamento="Caquetá", headless=False,
                                 max_pages=25, deep_crawl=True, max_depth=2, max_urls=1200)
     scraper.run()
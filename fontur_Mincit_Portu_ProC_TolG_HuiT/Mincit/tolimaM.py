@@ -2,14 +2,20 @@ from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
 import time
-import random
 import csv
 import json
 from datetime import datetime
+import os
+import sys
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))  # comun/ está en la carpeta raíz
+from comun.bloqueo_recursos import ResourceBlocker
+from comun.espera_carga import ReadyWaiter
 
 class TolimaScraper:
-    def __init__(self, headless=False):
+    def __init__(self, headless=False, block="medios"):
         self.headless = headless
+        self.blocker = ResourceBlocker(block)  # imágenes/fuentes/video/trackers no se descargan
+        self.ready = ReadyWaiter()  # espera por calma del DOM en lugar de pausas fijas
         self.driver = None
         self.all_results = []
         self.setup_driver()
@@ -25,16 +31,21 @@ class TolimaScraper:
         chrome_options.add_argument("--window-size=1920,1080")
         chrome_options.add_argument("--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36")
         chrome_options.add_experimental_option('excludeSwitches', ['enable-logging'])
+        self.blocker.configure(chrome_options)
         
         self.driver = webdriver.Chrome(options=chrome_options)
+        self.blocker.attach(self.driver)
         print("Navegador Chrome configurado correctamente")
     
     def navigate_to_url(self, url):
         """Navegar a una URL con manejo de errores"""
         try:
             print(f"🌐 Navegando a: {url}")
-            self.driver.get(url)
-            time.sleep(3)
+            reg = self.ready.load(self.driver, url, "body", by=By.TAG_NAME)
+            print(f"   ⏱️ {ReadyWaiter.describe(reg)}")
+            stats = self.blocker.page_stats(self.driver)
+            if stats["bloqueadas"]:
+                print(f"   🧱 {ResourceBlocker.describe(stats)}")
             return True
         except Exception as e:
             print(f"❌ Error navegando a {url}: {e}")
@@ -91,16 +102,14 @@ class TolimaScraper:
     def scroll_and_scrape(self, base_url, max_scrolls=10):
         """Realiza scroll hacia abajo y extrae resultados"""
         print(f"🔍 Iniciando scroll en: {base_url}")
-        self.driver.get(base_url)
+        self.ready.load(self.driver, base_url, "body", by=By.TAG_NAME)
         self.accept_cookies()
-        time.sleep(3)
         
         # Realizar scroll y extraer datos
         scroll_count = 0
         while scroll_count < max_scrolls:
             print(f"\n📄 Realizando scroll: {scroll_count + 1}")
-            self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-            time.sleep(random.uniform(2, 4))  # Esperar un poco para cargar nuevos resultados
+            reg = self.ready.scroll(self.driver, base_url, timeout=4)  # Esperar a que carguen los nuevos resultados
 
             # Extraer los datos de la página después de hacer scroll
             page_results = self.extract_search_page_data()
@@ -110,6 +119,9 @@ class TolimaScraper:
             print(f"📊 Total acumulado: {len(self.all_results)} resultados")
             
             scroll_count += 1
+            if reg["crecio"] is False:
+                print("⏹️ El scroll no trajo más resultados")
+                break
 
     def save_results(self):
         """Guardar todos los resultados"""
@@ -170,6 +182,12 @@ class TolimaScraper:
         
         end_time = time.time()
         print(f"\n⏱️ Tiempo total de ejecución: {round((end_time - start_time)/60, 1)} minutos")
+        bloqueo = self.blocker.summary()
+        if bloqueo:
+            print(f"🧱 {bloqueo}")
+        espera = self.ready.summary()
+        if espera:
+            print(f"⏱️ {espera}")
         print("🎉 Scraping completado exitosamente!")
 
     def close(self):
@@ -0,0 +1,120 @@
+# -*- coding: utf-8 -*-
+"""
+Micro-benchmark de la extracción de fichas de DetailScraper sobre páginas guardadas de colombia.travel.
+- "antes": la extracción original (select/find/find_all por campo: seis o más recorridos del
+  árbol, con una lambda por cada texto en las búsquedas de "dirección" y "horario")
+- "después": detalle.extract_detail (una sola pasada con walk_detail)
+- Verifica que ambas devuelvan los mismos campos en cada página
+
+Uso rápido:
+  python bench_detalle.py                        # fichas de ejemplo (fixtures/fichas/)
+  python bench_detalle.py fichas/ --repeat 20
+  python bench_detalle.py pagina1.html pagina2.html
+"""
+
+import os
+import glob
+import time
+import argparse
+
+from detalle import extract_detail
+from comun.parseo_html import make_soup
+
+# Fichas guardadas que vienen con el repositorio: con y sin cuerpo, dirección/horario (también
+# dentro de un <script>, que la búsqueda por texto original también encuentra), correo, teléfono y precio
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "fichas")
+
+FIELDS = ["descripcion", "telefono", "correo", "direccion", "horario", "redes", "precio", "detalles"]
+
+# Valores por defecto que trae la entrada del scraper del departamento
+ENTRY = {"descripcion": "Descripción del listado", "precio": "Consultar", "telefono": "", "detalles": ""}
+
+def extract_detail_v1(soup, entry):
+    """Extracción original de scrape_detail (referencia para medir y comparar)."""
+    descripcion_raw = soup.select("div.field-name-body p, article p, .content p")
+    descripcion = " ".join([p.get_text(strip=True) for p in descripcion_raw]) if descripcion_raw else entry.get("descripcion")
+
+    direccion = soup.find(string=lambda t: "dirección" in t.lower()) if soup else None
+    horario = soup.find(string=lambda t: "horario" in t.lower()) if soup else None
+    correo = soup.find("a", href=lambda h: h and "mailto:" in h)
+    telefono = soup.find("a", href=lambda h: h and "tel:" in h)
+
+    redes = [a["href"] for a in soup.find_all("a", href=True) if any(r in a["href"] for r in ["facebook", "instagram", "twitter", "youtube"])]
+
+    precios = soup.select("span.precio, div.price, .field-price")
+    precio = ", ".join([p.get_text(strip=True) for p in precios]) if precios else entry.get("precio")
+
+    secciones = soup.select("section, div.detalles, div.info")
+    detalles_texto = " ".join([s.get_text(strip=True) for s in secciones]) if secciones else entry.get("detalles")
+
+    descripcion_extendida = " ".join(filter(None, [
+        descripcion,
+        f"Dirección: {direccion}" if direccion else "",
+        f"Horario: {horario}" if horario else "",
+        f"Correo: {correo.get_text(strip=True)}" if correo else "",
+        f"Teléfono: {telefono.get_text(strip=True)}" if telefono else "",
+        f"Redes sociales: {', '.join(redes)}" if redes else "",
+        f"Detalles adicionales: {detalles_texto}" if detalles_texto else ""
+    ]))
+
+    return {
+        "descripcion": descripcion_extendida,
+        "telefono": telefono.get_text(strip=True) if telefono else entry.get("telefono"),
+        "correo": correo.get_text(strip=True) if correo else "",
+        "direccion": direccion if direccion else "",
+        "horario": horario if horario else "",
+        "redes": redes,
+        "precio": precio,
+        "detalles": detalles_texto,
+    }
+
+def load_pages(paths):
+    pages = []
+    for p in paths:
+        files = sorted(glob.glob(os.path.join(p, "*.html"))) if os.path.isdir(p) else sorted(glob.glob(p))
+        for path in files:
+            with open(path, "r", encoding="utf-8", errors="replace") as f:
+                pages.append((path, f.read()))
+    return pages
+
+def best_time(fn, soups, repeat):
+    best = None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        for soup in soups:
+            fn(soup, ENTRY)
+        elapsed = time.perf_counter() - t0
+        best = elapsed if best is None else min(best, elapsed)
+    return best / len(soups) * 1000
+
+def main():
+    ap = argparse.ArgumentParser(description="Compara la extracción original de fichas con la de una sola pasada.")
+    ap.add_argument("paths", nargs="*", default=[FIXTURES], help="Archivos .html o carpetas con fichas guardadas.")
+    ap.add_argument("--repeat", type=int, default=5, help="Repeticiones (se reporta la mejor).")
+    args = ap.parse_args()
+
+    pages = load_pages(args.paths)
+    if not pages:
+        raise SystemExit("No se encontraron páginas .html.")
+    # El parseo es igual en ambos casos: se mide solo la extracción
+    soups = [make_soup(html) for _, html in pages]
+
+    diffs = []
+    for (path, _), soup in zip(pages, soups):
+        ref, got = extract_detail_v1(soup, ENTRY), extract_detail(soup, ENTRY)
+        bad = [k for k in FIELDS if ref.get(k) != got.get(k)]
+        if bad:
+            diffs.append((path, bad))
+
+    antes = best_time(extract_detail_v1, soups, args.repeat)
+    despues = best_time(extract_detail, soups, args.repeat)
+    print(f"[OK] Páginas: {len(pages)} (diferencias: {len(diffs)})")
+    for path, bad in diffs[:5]:
+        print(f"       [DIF] {path}: {', '.join(bad)}")
+    print(f"[OK] Antes:   {antes:.2f} ms/pág")
+    print(f"[OK] Después: {despues:.2f} ms/pág (x{antes / despues:.1f})")
+    if diffs:
+        raise SystemExit(f"[ERROR] {len(diffs)} páginas con campos distintos entre ambas extracciones")
+
+if __name__ == "__main__":
+    main()
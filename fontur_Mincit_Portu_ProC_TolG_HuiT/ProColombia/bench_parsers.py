@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark de motores HTML (comun/parseo_html.py) sobre páginas guardadas de colombia.travel.
+- Corre extract_search_page_data (y con ella extract_result_data) del motor de deptos.py con
+  el perfil elegido sobre cada página, sin abrir Chrome
+- Tiempo de parseo y de extracción por motor, y equivalencia campo a campo contra html.parser
+  (fecha_extraccion se ignora: cambia en cada llamada)
+
+Uso rápido:
+  pip install lxml
+  python bench_parsers.py                                  # páginas de ejemplo (fixtures/busqueda/)
+  python bench_parsers.py paginas_guardadas/ --depto huila --repeat 5
+"""
+
+import io
+import os
+import glob
+import time
+import argparse
+from contextlib import redirect_stdout
+
+from deptos import ColombiaTravelScraper, available_profiles, load_profile
+from comun.parseo_html import PARSERS, DEFAULT_PARSER, available, make_soup, set_parser
+
+# Páginas de búsqueda guardadas que vienen con el repositorio (dos por departamento)
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "busqueda")
+
+def load_pages(paths):
+    pages = []
+    for p in paths:
+        files = sorted(glob.glob(os.path.join(p, "*.html"))) if os.path.isdir(p) else sorted(glob.glob(p))
+        for path in files:
+            with open(path, "r", encoding="utf-8", errors="replace") as f:
+                pages.append((path, f.read()))
+    return pages
+
+def offline_scraper(depto):
+    """Scraper con el perfil elegido; Chrome solo se abre al navegar, aquí no se navega."""
+    return ColombiaTravelScraper(load_profile(depto))
+
+def extract(scraper, html):
+    scraper.page_html = html
+    with redirect_stdout(io.StringIO()):
+        rows = scraper.extract_search_page_data()
+    return [{k: v for k, v in r.items() if k != "fecha_extraccion"} for r in rows]
+
+def best_time(fn, pages, repeat):
+    best = None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        for _, html in pages:
+            fn(html)
+        elapsed = time.perf_counter() - t0
+        best = elapsed if best is None else min(best, elapsed)
+    return best / len(pages) * 1000
+
+def main():
+    ap = argparse.ArgumentParser(description="Compara motores HTML en tiempo y en campos extraídos.")
+    ap.add_argument("paths", nargs="*", default=[FIXTURES],
+                    help="Archivos .html o carpetas con páginas de búsqueda guardadas.")
+    ap.add_argument("--depto", choices=available_profiles(), default="huila", help="Perfil cuyos extractores se usan.")
+    ap.add_argument("--repeat", type=int, default=5, help="Repeticiones (se reporta la mejor).")
+    args = ap.parse_args()
+
+    pages = load_pages(args.paths)
+    if not pages:
+        raise SystemExit("No se encontraron páginas .html.")
+    scraper = offline_scraper(args.depto)
+
+    set_parser(DEFAULT_PARSER)
+    reference = {path: extract(scraper, html) for path, html in pages}
+    total = sum(len(rows) for rows in reference.values())
+    print(f"[OK] Páginas: {len(pages)}, resultados: {total}  (referencia: {DEFAULT_PARSER})")
+    try:
+        for name in PARSERS:
+            if not available(name):
+                print(f"[--] {name}: no instalado")
+                continue
+            set_parser(name)
+            parse_ms = best_time(make_soup, pages, args.repeat)
+            full_ms = best_time(lambda html: extract(scraper, html), pages, args.repeat)
+            diffs = [path for path, html in pages if extract(scraper, html) != reference[path]]
+            print(f"[OK] {name:12s} parseo {parse_ms:7.2f} ms/pág  extracción {full_ms:7.2f} ms/pág  "
+                  f"páginas con diferencias: {len(diffs)}")
+            for path in diffs[:5]:
+                print(f"       [DIF] {path}")
+    finally:
+        set_parser(DEFAULT_PARSER)
+
+if __name__ == "__main__":
+    main()
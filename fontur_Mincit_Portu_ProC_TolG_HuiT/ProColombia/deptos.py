@@ -0,0 +1,869 @@
+# -*- coding: utf-8 -*-
+"""
+Motor común de colombia.travel (ProColombia) para huila.py, Tolima.py, caqueta.py y putumayo.py
+- Cada departamento es un perfil de datos (perfiles/<slug>.json): búsqueda principal, destinos,
+  categorías, búsquedas adicionales, palabras por categoría, municipios y enlaces relacionados;
+  agregar un departamento es agregar un perfil, no copiar un script
+- Varios departamentos en una sola corrida (--workers), cada uno con su propio Chrome
+- Caché de páginas en memoria compartido por todos los departamentos: una URL se carga una
+  sola vez (si dos departamentos la piden a la vez, el segundo espera al primero) y las
+  páginas servidas desde el caché no pagan la pausa de cortesía; el tiempo total crece con
+  las páginas únicas, no con departamentos x páginas
+- Los extractores leen el HTML guardado (page_html/page_url), no el navegador
+- Paginación de búsquedas: la primera página se abre en Chrome y de ella se lee el paginador
+  (o el número de resultados); las siguientes se piden por HTTP en paralelo, con tope por
+  host (--per-host) y unas pocas páginas por adelantado, y se procesan en orden de página.
+  Se corta en la primera página sin enlaces nuevos; si el HTML de una página no trae
+  resultados (buscador dependiente de JS) esa página se abre en Chrome
+- Exporta las 11 claves de siempre en este orden:
+  titulo, categoria, descripcion, enlace, imagen, ubicacion, tipo,
+  fecha_extraccion, precio, telefono, detalles
+  (un JSON/CSV por departamento, con el prefijo de cada perfil)
+
+Uso rápido:
+  pip install requests selenium beautifulsoup4
+  python deptos.py --deptos huila tolima caqueta putumayo --workers 2 --headless
+  python huila.py                 # un solo departamento
+"""
+
+from selenium import webdriver
+from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.common.by import By
+import os
+import sys
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))  # comun/ está en la carpeta raíz
+from comun.bloqueo_recursos import ResourceBlocker, PERFILES
+from comun.espera_carga import ReadyWaiter
+from comun.descarga import HostLimiter, extract_last_page, get_session
+from comun.parseo_html import PARSERS, get_parser, make_soup, set_parser
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urljoin
+import requests
+import json
+import csv
+import argparse
+import threading
+from datetime import datetime
+import time
+import re
+import math
+import random
+
+PERFILES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "perfiles")
+
+FIELDNAMES = [
+    'titulo', 'categoria', 'descripcion', 'enlace', 'imagen',
+    'ubicacion', 'tipo', 'fecha_extraccion', 'precio', 'telefono', 'detalles'
+]
+
+# Encabezados propios de colombia.travel (se pasan a get_session de comun/descarga.py)
+HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36",
+    "Accept-Language": "es-CO,es;q=0.9,en;q=0.8",
+}
+
+# Selectores de resultados de búsqueda, en orden de preferencia (se usa el primero que aparezca)
+RESULT_SELECTORS = [
+    'div.search-result', 'div.result-item', 'div.views-row',
+    'article.node', 'div.card', 'div.item-list div',
+    'div[class*="result"]', 'div[class*="item"]',
+    'li.search-result', 'li.result-item'
+]
+# Contenido mínimo para aceptar una página de búsqueda bajada por HTTP (sin los selectores genéricos)
+SEARCH_CONTENT = ('div.search-result, div.result-item, div.views-row, article.node, div.card, '
+                  'li.search-result, li.result-item')
+
+# Tarjetas propias del listado de resultados (para estimar páginas con el total anunciado)
+RESULT_CARDS = ('div.search-result, li.search-result, div.result-item, li.result-item, '
+                'div.view-content > div.views-row')
+# Zonas donde el buscador anuncia el total ("123 resultados"); no se busca en toda la página
+COUNT_SEL = ('.view-header, .search-summary, .search-results-count, .results-count, '
+             '.result-count, .search-results__count')
+
+_COUNT_RE = re.compile(r'(\d[\d.,]*)\s+resultados?', re.I)
+
+def available_profiles():
+    """Slugs de los perfiles disponibles (perfiles/*.json)"""
+    return sorted(f[:-5] for f in os.listdir(PERFILES_DIR) if f.endswith(".json"))
+
+def load_profile(slug):
+    """Leer el perfil de un departamento"""
+    path = os.path.join(PERFILES_DIR, f"{slug}.json")
+    if not os.path.exists(path):
+        raise ValueError(f"Perfil no encontrado: {slug} (disponibles: {', '.join(available_profiles())})")
+    with open(path, encoding="utf-8") as f:
+        perfil = json.load(f)
+    perfil["slug"] = slug
+    return perfil
+
+def find_result_elements(soup):
+    """(selector, elementos) del primer selector de RESULT_SELECTORS con coincidencias"""
+    for selector in RESULT_SELECTORS:
+        elements = soup.select(selector)
+        if elements:
+            return selector, elements
+    return None, []
+
+def extract_result_count(soup):
+    """Total de resultados anunciado en el encabezado del buscador ("123 resultados"); None si no aparece"""
+    for summary in soup.select(COUNT_SEL):
+        m = _COUNT_RE.search(summary.get_text(" "))
+        if m:
+            break
+    else:
+        return None
+    try:
+        return int(re.sub(r'[.,]', '', m.group(1)))
+    except ValueError:
+        return None
+
+class SharedPageCache:
+    """
+    Caché de páginas en memoria compartido entre hilos: url -> (url_final, html).
+    get_or_fetch(url, fetch) carga con fetch(url) solo la primera vez; si otro hilo ya la está
+    cargando, espera su resultado en lugar de abrirla de nuevo.
+    """
+    def __init__(self):
+        self._pages = {}
+        self._pending = {}
+        self._lock = threading.Lock()
+        self.stats = {"descargas": 0, "aciertos": 0}
+
+    def get_or_fetch(self, url, fetch):
+        """Devuelve ((url_final, html) o None, desde_cache)"""
+        with self._lock:
+            if url in self._pages:
+                self.stats["aciertos"] += 1
+                return self._pages[url], True
+            event = self._pending.get(url)
+            owner = event is None
+            if owner:
+                event = self._pending[url] = threading.Event()
+        if not owner:
+            event.wait()
+            with self._lock:
+                page = self._pages.get(url)
+                if page is not None:
+                    self.stats["aciertos"] += 1
+                    return page, True
+            # La carga del otro hilo falló: se intenta de nuevo sin guardar
+            return fetch(url), False
+        try:
+            page = fetch(url)
+            if page is not None:
+                with self._lock:
+                    self._pages[url] = page
+                    self.stats["descargas"] += 1
+            return page, False
+        finally:
+            with self._lock:
+                self._pending.pop(url, None)
+            event.set()
+
+    def __len__(self):
+        return len(self._pages)
+
+    def summary(self):
+        st = self.stats
+        total = st["descargas"] + st["aciertos"]
+        if not total:
+            return None
+        return (f"Caché compartido: {st['descargas']} páginas únicas cargadas, "
+                f"{st['aciertos']} servidas desde el caché ({st['aciertos'] / total:.0%} de {total} pedidas)")
+
+class ColombiaTravelScraper:
+    def __init__(self, perfil, headless=False, block="medios", cache=None, per_host=3,
+                 session=None, limiter=None):
+        self.perfil = perfil
+        self.departamento = perfil["departamento"]
+        self.headless = headless
+        self.blocker = ResourceBlocker(block)  # imágenes/fuentes/video/trackers no se descargan
+        self.ready = ReadyWaiter()  # espera por calma del DOM en lugar de pausas fijas
+        self.cache = cache  # SharedPageCache (opcional) compartido con otros departamentos
+        self.driver = None  # se abre con la primera página que no esté en el caché
+        # Páginas de búsqueda siguientes por HTTP (sesión y tope por host compartibles entre departamentos)
+        self.per_host = max(1, int(per_host))
+        self._own_session = session is None
+        self.session = session or get_session(pool_size=self.per_host, headers=HEADERS)
+        self.limiter = limiter or HostLimiter(self.per_host)
+        self._pool = None
+        self.http_search = True  # se apaga si el HTML del buscador llega sin resultados (depende de JS)
+        self.search_stats = {"paginas": 0, "http": 0, "cache": 0, "navegador": 0,
+                             "adelantadas": 0, "descartadas": 0}
+        self.page_html = ""
+        self.page_url = ""
+        self.from_cache = False
+        self.all_results = []
+        self.seen_links = set()  # enlaces ya en all_results (búsqueda, categorías, destinos y relacionados)
+        self.visited_urls = set()
+        self.cookies_ok = False
+        self.location_names = perfil.get("ubicaciones_nombres", {})
+
+    def setup_driver(self):
+        """Configurar el navegador Chrome"""
+        chrome_options = Options()
+        if self.headless:
+            chrome_options.add_argument("--headless")
+        chrome_options.add_argument("--no-sandbox")
+        chrome_options.add_argument("--disable-dev-shm-usage")
+        chrome_options.add_argument("--disable-gpu")
+        chrome_options.add_argument("--window-size=1920,1080")
+        chrome_options.add_argument("--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36")
+        chrome_options.add_experimental_option('excludeSwitches', ['enable-logging'])
+        self.blocker.configure(chrome_options)
+
+        self.driver = webdriver.Chrome(options=chrome_options)
+        self.blocker.attach(self.driver)
+        print(f"Navegador Chrome configurado correctamente ({self.departamento})")
+
+    def load_page(self, url):
+        """Cargar una URL en Chrome; devuelve (url_final, html)"""
+        if self.driver is None:
+            self.setup_driver()
+        reg = self.ready.load(self.driver, url, "body", by=By.TAG_NAME)
+        print(f"   ⏱️ {ReadyWaiter.describe(reg)}")
+        stats = self.blocker.page_stats(self.driver)
+        if stats["bloqueadas"]:
+            print(f"   🧱 {ResourceBlocker.describe(stats)}")
+        if not self.cookies_ok:
+            self.cookies_ok = self.accept_cookies()
+        return self.driver.current_url, self.driver.page_source
+
+    def navigate_to_url(self, url):
+        """Navegar a una URL con manejo de errores (desde el caché compartido si ya se cargó)"""
+        try:
+            if url in self.visited_urls:
+                return False
+
+            print(f"🌐 Navegando a: {url}")
+            if self.cache is not None:
+                page, self.from_cache = self.cache.get_or_fetch(url, self.load_page)
+            else:
+                page, self.from_cache = self.load_page(url), False
+            if page is None:
+                return False
+            if self.from_cache:
+                print("   ♻️ desde el caché compartido")
+            self.page_url, self.page_html = page
+            self.visited_urls.add(url)
+            return True
+        except Exception as e:
+            print(f"❌ Error navegando a {url}: {e}")
+            return False
+
+    def pause(self, low, high):
+        """Pausa de cortesía; no aplica si la página salió del caché"""
+        if not self.from_cache:
+            time.sleep(random.uniform(low, high))
+
+    def accept_cookies(self):
+        """Aceptar cookies"""
+        try:
+            cookie_buttons = self.driver.find_elements(By.XPATH,
+                "//button[contains(text(), 'Aceptar') or contains(text(), 'Aceptar todas')]"
+            )
+            for button in cookie_buttons:
+                try:
+                    if button.is_displayed():
+                        button.click()
+                        print("✅ Cookies aceptadas")
+                        time.sleep(2)
+                        return True
+                except:
+                    continue
+            return False
+        except:
+            return False
+
+    def add_result(self, result):
+        """Agregar un resultado si su enlace no se había visto; devuelve True si se agregó"""
+        if result['enlace'] in self.seen_links:
+            return False
+        self.seen_links.add(result['enlace'])
+        self.all_results.append(result)
+        return True
+
+    def scrape_search_results(self, base_url, max_pages=20):
+        """Scraping profundo de resultados de búsqueda (páginas siguientes en paralelo por HTTP)"""
+        print(f"🔍 Iniciando scraping de búsqueda: {base_url}")
+
+        if not self.navigate_to_url(base_url):
+            return
+
+        search_url = self.page_url
+        page = self.extract_page_number(search_url)
+        last_page, stop_page = self.estimate_last_page(page, max_pages)
+        window = {}  # página -> Future de la descarga por adelantado
+        page_count = 0
+
+        try:
+            while True:
+                print(f"\n📄 Procesando página {page_count + 1}: {self.page_url}")
+
+                # Extraer datos de la página actual
+                page_results = self.extract_search_page_data()
+                for result in page_results:
+                    self.add_result(result)
+                self.search_stats["paginas"] += 1
+
+                print(f"✅ Encontrados {len(page_results)} resultados en esta página")
+                print(f"📊 Total acumulado: {len(self.all_results)} resultados")
+
+                if not page_results:
+                    print("⏹️ La página no trajo enlaces nuevos; fin de la búsqueda")
+                    break
+
+                page += 1
+                page_count += 1
+                if page > stop_page:
+                    print("⏹️ No hay más páginas de búsqueda")
+                    break
+
+                # Las siguientes páginas se descargan mientras se procesa esta
+                self.prefetch_search_pages(window, search_url, page, last_page)
+                if not self.open_search_page(self.search_page_url(search_url, page), window.pop(page, None)):
+                    print("⏹️ No hay más páginas de búsqueda")
+                    break
+        finally:
+            for fut in window.values():
+                if not fut.cancel():
+                    self.search_stats["descartadas"] += 1  # ya estaba en curso o descargada
+
+    def estimate_last_page(self, first_page, max_pages):
+        """
+        (última página a descargar por adelantado, última página a recorrer), con tope max_pages.
+        - Paginador: es exacto y vale para ambas
+        - Total de resultados / tarjetas por página: es solo una cota inferior; se adelanta hasta
+          ahí y luego se sigue de a una hasta la primera página sin enlaces nuevos
+        - Nada: se avanza hasta la primera página sin enlaces nuevos
+        """
+        limit = first_page + max_pages - 1
+        soup = make_soup(self.page_html)
+        last_page = extract_last_page(soup)
+        if last_page is not None:
+            print(f"📑 Paginador: {last_page + 1} páginas")
+            last_page = min(max(last_page, first_page), limit)
+            return last_page, last_page
+        total = extract_result_count(soup)
+        cards = soup.select(RESULT_CARDS)
+        if total and cards:
+            estimate = math.ceil(total / len(cards)) - 1
+            print(f"📑 Sin paginador: al menos {estimate + 1} páginas según el total ({total} resultados)")
+            return min(max(estimate, first_page), limit), limit
+        print("📑 Sin paginador: se avanza hasta la primera página sin enlaces nuevos")
+        return limit, limit
+
+    def search_page_url(self, search_url, page):
+        """URL de la página N de una búsqueda"""
+        if 'page=' in search_url:
+            return re.sub(r'page=\d+', f'page={page}', search_url)
+        separator = '&' if '?' in search_url else '?'
+        return f"{search_url}{separator}page={page}"
+
+    def prefetch_search_pages(self, window, search_url, page, last_page):
+        """Mantener en vuelo hasta per_host páginas siguientes (sin pasar de last_page; después, de a una)"""
+        if not self.http_search:
+            return
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(max_workers=self.per_host)
+        end = min(last_page, page + self.per_host - 1) if page <= last_page else page
+        for p in range(page, end + 1):
+            url = self.search_page_url(search_url, p)
+            if p not in window and url not in self.visited_urls:
+                window[p] = self._pool.submit(self.fetch_search_page, url)
+                self.search_stats["adelantadas"] += 1
+
+    def fetch_search_page(self, url):
+        """En un hilo del pool: caché compartido o HTTP; devuelve ((url_final, html) o None, desde_cache)"""
+        if self.cache is not None:
+            return self.cache.get_or_fetch(url, self.fetch_search_http)
+        return self.fetch_search_http(url), False
+
+    def fetch_search_http(self, url):
+        """Página de búsqueda por HTTP, sin Chrome; None si falla o si el HTML no trae resultados"""
+        with self.limiter.slot(url):
+            try:
+                r = self.session.get(url, timeout=(10, 25))
+            except requests.RequestException as e:
+                print(f"   ⚠️ HTTP falló en {url}: {e}")
+                return None
+            finally:
+                time.sleep(random.uniform(0.5, 1.5))  # cortesía dentro del cupo del host
+        if r.status_code >= 400:
+            return None
+        # colombia.travel sirve UTF-8; requests asume latin-1 si falta el charset
+        encoding = r.encoding if r.encoding and r.encoding.lower() != "iso-8859-1" else "utf-8"
+        html = r.content.decode(encoding, "replace")
+        if make_soup(html).select_one(SEARCH_CONTENT) is None:
+            return None
+        return r.url, html
+
+    def open_search_page(self, url, future):
+        """Dejar lista la página de búsqueda: la descargada por adelantado o, si no sirvió, Chrome"""
+        if url in self.visited_urls:
+            return False
+        page, cached = future.result() if future is not None else (None, False)
+        if page is not None:
+            self.page_url, self.page_html = page
+            self.from_cache = cached
+            self.visited_urls.add(url)
+            self.search_stats["cache" if cached else "http"] += 1
+            print(f"🌐 {url} ({'caché compartido' if cached else 'HTTP'})")
+            return True
+        if future is not None and self.search_stats["http"] == 0:
+            # El HTML del buscador llega sin resultados: se sigue solo con Chrome
+            print("   ⚠️ El buscador no trae resultados sin JavaScript; se sigue con Chrome")
+            self.http_search = False
+        self.search_stats["navegador"] += 1
+        self.pause(2, 4)
+        return self.navigate_to_url(url)
+
+    def explore_destinations(self):
+        """Explorar destinos específicos del departamento"""
+        print(f"\n🏔️ Explorando destinos específicos {self.perfil['con_articulo']}...")
+
+        for destination_url in self.perfil["destinos"]:
+            if self.navigate_to_url(destination_url):
+                print(f"📍 Explorando destino: {destination_url}")
+
+                # Extraer información del destino
+                destination_data = self.extract_destination_data()
+                if destination_data:
+                    self.add_result(destination_data)
+
+                # Buscar enlaces relacionados dentro del destino
+                self.explore_related_links()
+
+                self.pause(2, 3)
+
+    def explore_tourism_categories(self):
+        """Explorar categorías turísticas del departamento"""
+        print("\n🎯 Explorando categorías turísticas...")
+
+        for category_name, category_url in self.perfil["categorias"].items():
+            if self.navigate_to_url(category_url):
+                print(f"🏷️ Explorando categoría: {category_name}")
+
+                # Extraer resultados de la categoría
+                category_results = self.extract_category_data(category_name)
+                for result in category_results:
+                    self.add_result(result)
+
+                print(f"✅ Encontrados {len(category_results)} resultados en {category_name}")
+
+                self.pause(2, 3)
+
+    def extract_search_page_data(self):
+        """Extraer datos de la página de búsqueda actual"""
+        soup = make_soup(self.page_html)
+        results = []
+        page_links = set()
+
+        # Múltiples selectores para resultados (RESULT_SELECTORS, se usa el primero que aparezca)
+        selector, elements = find_result_elements(soup)
+        if elements:
+            print(f"🔎 Encontrados {len(elements)} elementos con {selector}")
+            for element in elements:
+                result_data = self.extract_result_data(element)
+                if result_data and result_data['enlace'] not in self.seen_links \
+                        and result_data['enlace'] not in page_links:
+                    page_links.add(result_data['enlace'])
+                    results.append(result_data)
+
+        return results
+
+    def extract_destination_data(self):
+        """Extraer datos de página de destino"""
+        soup = make_soup(self.page_html)
+
+        # Extraer información principal del destino
+        title = self.safe_extract(soup, ['h1', '.page-title', '.title'])
+        description = self.safe_extract(soup, ['.field--name-body', '.description', 'article p'])
+
+        if not title:
+            return None
+
+        # Extraer detalles y convertirlos a string para CSV
+        detalles = self.extract_destination_details(soup)
+        detalles_str = json.dumps(detalles, ensure_ascii=False) if detalles else ""
+
+        return {
+            'titulo': title,
+            'categoria': 'destino_principal',
+            'descripcion': description[:500] if description else f"Destino turístico en {self.departamento}",
+            'enlace': self.page_url,
+            'imagen': self.extract_main_image(soup),
+            'ubicacion': self.extract_location_from_text(title),
+            'tipo': 'destino',
+            'fecha_extraccion': datetime.now().isoformat(),
+            'precio': 'Consultar',
+            'telefono': '',
+            'detalles': detalles_str  # Convertido a string para CSV
+        }
+
+    def extract_category_data(self, category_name):
+        """Extraer datos de categorías turísticas"""
+        soup = make_soup(self.page_html)
+        results = []
+        page_links = set()
+
+        # Buscar elementos de la categoría
+        elements = soup.select('div.card, article.node, div.views-row, div.result-item')
+
+        for element in elements:
+            result_data = self.extract_result_data(element)
+            if result_data:
+                result_data['categoria'] = category_name
+                if result_data['enlace'] not in self.seen_links and result_data['enlace'] not in page_links:
+                    page_links.add(result_data['enlace'])
+                    results.append(result_data)
+
+        return results
+
+    def extract_result_data(self, element):
+        """Extraer datos de un resultado individual"""
+        try:
+            title = self.safe_extract(element, ['h2', 'h3', 'h4', '.title', '.card-title', 'a'])
+            if not title:
+                return None
+
+            link = self.extract_link(element)
+            if not link or link == "#":
+                return None
+
+            return {
+                'titulo': title,
+                'categoria': self.determine_category(element, title),
+                'descripcion': self.safe_extract(element, ['p', '.description', '.card-text']),
+                'enlace': link,
+                'imagen': self.extract_image(element),
+                'ubicacion': self.extract_location_from_text(title),
+                'tipo': 'resultado_busqueda',
+                'fecha_extraccion': datetime.now().isoformat(),
+                'precio': self.extract_price(element),
+                'telefono': self.extract_phone(element),
+                'detalles': ''  # Campo vacío para consistencia con CSV
+            }
+
+        except Exception as e:
+            print(f"Error extrayendo resultado: {e}")
+            return None
+
+    def safe_extract(self, element, selectors):
+        """Extraer texto de forma segura"""
+        for selector in selectors:
+            try:
+                elem = element.select_one(selector)
+                if elem:
+                    text = elem.get_text(strip=True)
+                    if text and len(text) > 2:
+                        return text
+            except:
+                continue
+        return None
+
+    def extract_link(self, element):
+        """Extraer enlace"""
+        try:
+            link_elem = element.select_one('a[href]')
+            if link_elem and link_elem.has_attr('href'):
+                href = link_elem['href']
+                if href.startswith('/'):
+                    return f"https://colombia.travel{href}"
+                elif href.startswith('http'):
+                    return href
+        except:
+            pass
+        return "#"
+
+    def extract_image(self, element):
+        """Extraer imagen"""
+        try:
+            img_elem = element.select_one('img[src]')
+            if img_elem:
+                src = img_elem['src']
+                if src.startswith('/'):
+                    return f"https://colombia.travel{src}"
+                return src
+        except:
+            pass
+        return ""
+
+    def extract_main_image(self, soup):
+        """Extraer imagen principal"""
+        try:
+            img = soup.select_one('meta[property="og:image"]')
+            if img and img.has_attr('content'):
+                return img['content']
+        except:
+            pass
+        return ""
+
+    def determine_category(self, element, title):
+        """Determinar categoría basado en contenido (palabras del perfil, en orden)"""
+        text = (element.get_text() + " " + title).lower()
+
+        for cat, keywords in self.perfil["palabras_categoria"].items():
+            if any(keyword in text for keyword in keywords):
+                return cat
+
+        return 'atraccion_turistica'
+
+    def extract_location_from_text(self, text):
+        """Extraer ubicación del texto (municipios del perfil, en orden)"""
+        text_lower = text.lower()
+        for location in self.perfil["ubicaciones"]:
+            if location in text_lower:
+                # Nombres sin tilde en el perfil se muestran con su forma correcta
+                return self.location_names.get(location, location.capitalize())
+
+        return self.departamento
+
+    def extract_price(self, element):
+        """Extraer información de precio"""
+        text = element.get_text()
+        prices = re.findall(r'\$\s*\d+(?:\.\d+)?|\d+\s*(?:USD|COP|pesos)', text, re.IGNORECASE)
+        return prices[0] if prices else "Consultar"
+
+    def extract_phone(self, element):
+        """Extraer teléfono"""
+        text = element.get_text()
+        phones = re.findall(r'(\+?\d{1,3}[\s-]?)?\(?\d{3}\)?[\s-]?\d{3}[\s-]?\d{4}', text)
+        return phones[0] if phones else ""
+
+    def extract_destination_details(self, soup):
+        """Extraer detalles específicos de destino"""
+        details = {}
+        limit = self.perfil.get("detalles_limite", 3)
+
+        # Extraer características
+        features = soup.select('.field--name-field-features .field__item, .characteristics li')
+        if features:
+            details['caracteristicas'] = [f.get_text(strip=True) for f in features[:limit]]
+
+        # Extraer actividades
+        activities = soup.select('.field--name-field-activities .field__item, .activities li')
+        if activities:
+            details['actividades'] = [a.get_text(strip=True) for a in activities[:limit]]
+
+        return details
+
+    def extract_page_number(self, url):
+        """Extraer número de página de la URL"""
+        match = re.search(r'page=(\d+)', url)
+        return int(match.group(1)) if match else 0
+
+    def find_related_links(self):
+        """Enlaces relacionados de la página actual (términos del perfil en el href o textos en el ancla)"""
+        relacionados = self.perfil["relacionados"]
+        soup = make_soup(self.page_html)
+        links = []
+        for a in soup.select('a[href]'):
+            href = a['href']
+            if any(term in href for term in relacionados["href"]) or \
+                    any(texto in a.get_text() for texto in relacionados["textos"]):
+                links.append(urljoin(self.page_url, href))
+        return links[:relacionados["limite"]]  # Limitar para no saturar
+
+    def explore_related_links(self):
+        """Explorar enlaces relacionados dentro de una página"""
+        try:
+            for href in self.find_related_links():
+                if 'colombia.travel' in href and href not in self.visited_urls:
+                    print(f"🔗 Explorando enlace relacionado: {href}")
+                    if self.navigate_to_url(href):
+                        related_data = self.extract_destination_data()
+                        if related_data:
+                            self.add_result(related_data)
+                        self.pause(2, 2)
+
+        except Exception as e:
+            print(f"Error explorando enlaces relacionados: {e}")
+
+    def save_results(self):
+        """Guardar todos los resultados"""
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+
+        if self.all_results:
+            # add_result ya descarta enlaces repetidos al agregar
+            unique_results = self.all_results
+
+            print(f"\n💾 Guardando {len(unique_results)} resultados únicos...")
+
+            # JSON
+            json_filename = f"{self.perfil['salida']}_{timestamp}.json"
+            with open(json_filename, 'w', encoding='utf-8') as f:
+                json.dump(unique_results, f, indent=2, ensure_ascii=False)
+            print(f"✅ JSON guardado: {json_filename}")
+
+            # CSV
+            csv_filename = f"{self.perfil['salida']}_{timestamp}.csv"
+            with open(csv_filename, 'w', encoding='utf-8', newline='') as f:
+                writer = csv.DictWriter(f, fieldnames=FIELDNAMES)
+                writer.writeheader()
+                writer.writerows(unique_results)
+            print(f"✅ CSV guardado: {csv_filename}")
+
+            # Generar reporte
+            self.generate_report(unique_results)
+
+        else:
+            print("❌ No se encontraron resultados para guardar")
+
+    def generate_report(self, results):
+        """Generar reporte detallado"""
+        print(f"\n📊 REPORTE COMPLETO DE TURISMO EN {self.departamento.upper()}")
+        print("=" * 60)
+
+        # Estadísticas por categoría
+        categories = {}
+        for result in results:
+            cat = result['categoria']
+            categories[cat] = categories.get(cat, 0) + 1
+
+        print("\n📈 DISTRIBUCIÓN POR CATEGORÍAS:")
+        for cat, count in sorted(categories.items(), key=lambda x: x[1], reverse=True):
+            print(f"   {cat}: {count} resultados")
+
+        # Estadísticas por ubicación
+        locations = {}
+        for result in results:
+            loc = result['ubicacion']
+            locations[loc] = locations.get(loc, 0) + 1
+
+        print("\n🗺️ DISTRIBUCIÓN POR UBICACIÓN:")
+        for loc, count in sorted(locations.items(), key=lambda x: x[1], reverse=True)[:10]:
+            print(f"   {loc}: {count} resultados")
+
+        print(f"\n⭐ TOTAL DE RESULTADOS ÚNICOS: {len(results)}")
+        print("=" * 60)
+
+    def run_complete_scraping(self):
+        """Ejecutar scraping completo del departamento"""
+        print(f"🚀 INICIANDO SCRAPING COMPLETO {self.perfil['con_articulo'].upper()}")
+        print("⏰ Esto puede tomar 10-15 minutos...\n")
+
+        start_time = time.time()
+
+        # 1. Scraping de búsqueda principal
+        busqueda = self.perfil["busqueda"]
+        self.scrape_search_results(busqueda["url"], max_pages=busqueda["max_pages"])
+
+        # 2. Explorar destinos específicos
+        self.explore_destinations()
+
+        # 3. Explorar categorías turísticas
+        self.explore_tourism_categories()
+
+        # 4. Búsquedas adicionales (si el perfil las tiene)
+        adicionales = self.perfil.get("busquedas_adicionales") or {}
+        for search_url in adicionales.get("urls", []):
+            self.scrape_search_results(search_url, max_pages=adicionales.get("max_pages", 3))
+
+        # 5. Guardar resultados
+        self.save_results()
+
+        end_time = time.time()
+        print(f"\n⏱️ Tiempo total de ejecución ({self.departamento}): {round((end_time - start_time)/60, 1)} minutos")
+        bloqueo = self.blocker.summary()
+        if bloqueo:
+            print(f"🧱 {bloqueo}")
+        espera = self.ready.summary()
+        if espera:
+            print(f"⏱️ {espera}")
+        st = self.search_stats
+        if st["paginas"]:
+            print(f"📑 Búsquedas: {st['paginas']} páginas; siguientes por HTTP={st['http']}, caché={st['cache']}, "
+                  f"Chrome={st['navegador']} ({st['adelantadas']} adelantadas, {st['descartadas']} sin usar por corte)")
+        print("🎉 Scraping completado exitosamente!")
+
+    def close(self):
+        """Cerrar el navegador (y el pool/sesión HTTP propios)"""
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+        if self._own_session:
+            self.session.close()
+        if self.driver:
+            self.driver.quit()
+            self.driver = None
+            print(f"👋 Navegador cerrado ({self.departamento})")
+
+def run_departamentos(slugs, workers=2, headless=False, block="medios", per_host=3):
+    """Correr varios departamentos en paralelo con un caché de páginas, sesión y tope por host compartidos"""
+    cache = SharedPageCache()
+    session = get_session(pool_size=max(1, workers) * per_host, headers=HEADERS)
+    limiter = HostLimiter(per_host)
+    perfiles = [load_profile(slug) for slug in slugs]
+    start_time = time.time()
+
+    def run_one(perfil):
+        scraper = ColombiaTravelScraper(perfil, headless=headless, block=block, cache=cache,
+                                        per_host=per_host, session=session, limiter=limiter)
+        try:
+            scraper.run_complete_scraping()
+            return perfil["departamento"], len(scraper.all_results)
+        except Exception as e:
+            print(f"❌ Error durante el scraping de {perfil['departamento']}: {e}")
+            import traceback
+            traceback.print_exc()
+            return perfil["departamento"], None
+        finally:
+            scraper.close()
+
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+            resumen = list(pool.map(run_one, perfiles))
+    finally:
+        session.close()
+
+    print(f"\n📋 RESUMEN ({len(perfiles)} departamentos, {round((time.time() - start_time)/60, 1)} minutos)")
+    for nombre, total in resumen:
+        print(f"   {nombre}: " + (f"{total} resultados" if total is not None else "con errores"))
+    compartido = cache.summary()
+    if compartido:
+        print(f"♻️ {compartido}")
+    return resumen
+
+def build_parser(description):
+    ap = argparse.ArgumentParser(description=description)
+    ap.add_argument("--headless", action="store_true", help="Ejecutar Chrome en modo headless.")
+    ap.add_argument("--parser", choices=PARSERS, default=get_parser(),
+                    help="Motor HTML de BeautifulSoup (lxml es más rápido; ver bench_parsers.py).")
+    ap.add_argument("--block", choices=PERFILES, default="medios",
+                    help="Recursos que Chrome no descarga: 'medios' (imágenes, fuentes, video, trackers), "
+                         "'agresivo' (además CSS) o 'ninguno'.")
+    ap.add_argument("--per-host", type=int, default=3,
+                    help="Páginas de búsqueda descargadas a la vez por HTTP (y adelantadas) por host.")
+    return ap
+
+def main_departamento(slug):
+    """CLI de un solo departamento (huila.py, Tolima.py, caqueta.py, putumayo.py)"""
+    perfil = load_profile(slug)
+    args = build_parser(f"Scraper de colombia.travel para {perfil['departamento']}.").parse_args()
+    set_parser(args.parser)
+    scraper = ColombiaTravelScraper(perfil, headless=args.headless, block=args.block, per_host=args.per_host)
+
+    try:
+        scraper.run_complete_scraping()
+
+    except Exception as e:
+        print(f"❌ Error durante el scraping: {e}")
+        import traceback
+        traceback.print_exc()
+
+    finally:
+        scraper.close()
+
+def main():
+    ap = build_parser("Scraper de colombia.travel para varios departamentos en una sola corrida.")
+    ap.add_argument("--deptos", nargs="+", choices=available_profiles(), default=available_profiles(),
+                    help="Departamentos a procesar (perfiles/<slug>.json; por defecto todos).")
+    ap.add_argument("--workers", type=int, default=2, help="Departamentos en paralelo (un Chrome por departamento).")
+    args = ap.parse_args()
+    set_parser(args.parser)
+    run_departamentos(args.deptos, workers=args.workers, headless=args.headless, block=args.block,
+                      per_host=args.per_host)
+
+if __name__ == "__main__":
+    main()
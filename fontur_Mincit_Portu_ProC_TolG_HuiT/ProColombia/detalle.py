@@ -0,0 +1,465 @@
+# -*- coding: utf-8 -*-
+"""
+Enriquecimiento de fichas de colombia.travel (DetailScraper), común a
+Scdetalladohuila.py, Scdetalladotolima.py, Scdetalladocaqueta.py y Scdetalladoputumayo.py
+- Entrada: el JSON de huila.py/Tolima.py/caqueta.py/putumayo.py; se visita cada 'enlace' y se
+  agregan descripción extendida, dirección, horario, correo, teléfono, redes, precio y detalles
+- Modo "http" (por defecto): sesión HTTP con pool y reintentos (429/5xx), varias fichas a la vez
+  (--workers) con tope por host (--per-host). Solo las fichas que no pasan la verificación de
+  contenido (párrafos del cuerpo con texto suficiente) o que fallan por HTTP se abren en
+  Chrome, una a una, al final
+- Modo "selenium": todas las fichas con Chrome, como antes
+- Campos de la ficha en una sola pasada por el árbol (walk_detail), en lugar de una búsqueda
+  completa por campo; bench_detalle.py compara ambas sobre páginas guardadas
+- Modo incremental (--incremental): se carga la salida anterior (<prefijo>_detalles.json, en la
+  carpeta actual o en Resultados/) indexada por 'enlace'; las fichas enriquecidas hace menos de
+  --max-age-days (según fecha_detalle) y sin error se reutilizan tal cual, y solo se visitan
+  los enlaces nuevos, vencidos o con error. La salida une ambas en el orden de la entrada
+- Latencia por URL (vía, estado, segundos) en <salida>_latencias.csv y resumen de fallas al final
+- Salida: <prefijo>_detalles.json/.csv (prefijo = nombre de la entrada sin el timestamp)
+
+Uso rápido:
+  python Scdetalladohuila.py --workers 8
+  python Scdetalladohuila.py --incremental --max-age-days 30
+  python detalle.py turismo_huila_completo_20250901_164631.json --mode selenium
+"""
+
+import json
+import csv
+import os
+import re
+import time
+import random
+import argparse
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+import requests
+from bs4 import NavigableString, Tag
+from selenium import webdriver
+from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.common.by import By
+import sys
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))  # comun/ está en la carpeta raíz
+from comun.bloqueo_recursos import ResourceBlocker, PERFILES
+from comun.descarga import HostLimiter, get_session
+from comun.espera_carga import ReadyWaiter
+from deptos import HEADERS
+from comun.parseo_html import PARSERS, get_parser, make_soup, set_parser
+
+MODES = ("http", "selenium")
+
+# Una ficha bajada por HTTP se acepta si los párrafos del cuerpo (los mismos de la descripción)
+# suman texto suficiente; el título y el menú/pie de la plantilla no cuentan
+CONTENT_SEL = "div.field-name-body p, article p, .content p"
+MIN_TEXT = 200
+
+def has_content(soup, min_text=MIN_TEXT):
+    """Verificación de "contenido presente" de una ficha sin JavaScript"""
+    texto = sum(len(p.get_text(" ", strip=True)) for p in soup.select(CONTENT_SEL))
+    return texto >= min_text
+
+REDES = ("facebook", "instagram", "twitter", "youtube")
+
+def _in_description(p):
+    # Equivale a "div.field-name-body p, article p, .content p": algún ancestro es uno de esos
+    for parent in p.parents:
+        classes = parent.get("class") or ()
+        if parent.name == "article" or "content" in classes or \
+                (parent.name == "div" and "field-name-body" in classes):
+            return True
+    return False
+
+def walk_detail(soup):
+    """
+    Una sola pasada por el árbol, en orden de documento, que junta lo que antes eran seis
+    búsquedas completas: párrafos de descripción, primer texto con "dirección" y con "horario"
+    (como find(string=...), cualquier texto, incluso de <script> o comentarios), primer enlace
+    mailto:/tel:, enlaces a redes, nodos de precio y secciones de detalle.
+    """
+    found = {"parrafos": [], "direccion": None, "horario": None, "correo": None,
+             "telefono": None, "redes": [], "precios": [], "secciones": []}
+    pending_text = 2  # dirección y horario aún sin encontrar
+    for node in soup.descendants:
+        if isinstance(node, NavigableString):
+            if pending_text:
+                low = node.lower()
+                if found["direccion"] is None and "dirección" in low:
+                    found["direccion"] = node
+                    pending_text -= 1
+                if found["horario"] is None and "horario" in low:
+                    found["horario"] = node
+                    pending_text -= 1
+            continue
+        if not isinstance(node, Tag):
+            continue
+        name = node.name
+        classes = node.get("class") or ()
+        if name == "p":
+            if _in_description(node):
+                found["parrafos"].append(node)
+        elif name == "a":
+            href = node.get("href")
+            if href is not None:
+                if found["correo"] is None and "mailto:" in href:
+                    found["correo"] = node
+                if found["telefono"] is None and "tel:" in href:
+                    found["telefono"] = node
+                if any(r in href for r in REDES):
+                    found["redes"].append(href)
+        if (name == "span" and "precio" in classes) or (name == "div" and "price" in classes) \
+                or "field-price" in classes:
+            found["precios"].append(node)
+        if name == "section" or (name == "div" and ("detalles" in classes or "info" in classes)):
+            found["secciones"].append(node)
+    return found
+
+def extract_detail(soup, entry):
+    """Campos enriquecidos de una ficha (sin fecha_detalle); entry aporta los valores por defecto"""
+    found = walk_detail(soup)
+
+    # Capturar texto de varios posibles lugares
+    descripcion_raw = found["parrafos"]
+    descripcion = " ".join([p.get_text(strip=True) for p in descripcion_raw]) if descripcion_raw else entry.get("descripcion")
+
+    # Extra: Dirección, horarios, contacto
+    direccion = found["direccion"]
+    horario = found["horario"]
+    correo = found["correo"]
+    telefono = found["telefono"]
+
+    # Redes sociales
+    redes = found["redes"]
+
+    # Precios (si aparecen en divs o spans)
+    precios = found["precios"]
+    precio = ", ".join([p.get_text(strip=True) for p in precios]) if precios else entry.get("precio")
+
+    # Secciones de detalle
+    secciones = found["secciones"]
+    detalles_texto = " ".join([s.get_text(strip=True) for s in secciones]) if secciones else entry.get("detalles")
+
+    # Unir todo en un campo más largo
+    descripcion_extendida = " ".join(filter(None, [
+        descripcion,
+        f"Dirección: {direccion}" if direccion else "",
+        f"Horario: {horario}" if horario else "",
+        f"Correo: {correo.get_text(strip=True)}" if correo else "",
+        f"Teléfono: {telefono.get_text(strip=True)}" if telefono else "",
+        f"Redes sociales: {', '.join(redes)}" if redes else "",
+        f"Detalles adicionales: {detalles_texto}" if detalles_texto else ""
+    ]))
+
+    return {
+        "descripcion": descripcion_extendida,
+        "telefono": telefono.get_text(strip=True) if telefono else entry.get("telefono"),
+        "correo": correo.get_text(strip=True) if correo else "",
+        "direccion": direccion if direccion else "",
+        "horario": horario if horario else "",
+        "redes": redes,
+        "precio": precio,
+        "detalles": detalles_texto,
+    }
+
+def output_prefix(input_file):
+    """turismo_huila_completo_20250901_164631.json -> turismo_huila_completo_detalles"""
+    base = os.path.splitext(os.path.basename(input_file))[0]
+    return re.sub(r'_\d{8}_\d{6}$', '', base) + "_detalles"
+
+def previous_output(input_file):
+    """Salida anterior de detalles para el modo incremental: carpeta actual o Resultados/; None si no hay"""
+    name = f"{output_prefix(input_file)}.json"
+    for path in (name, os.path.join("Resultados", name)):
+        if os.path.exists(path):
+            return path
+    return None
+
+def load_previous(path):
+    """Salida anterior indexada por enlace"""
+    with open(path, "r", encoding="utf-8") as f:
+        return {rec["enlace"]: rec for rec in json.load(f) if rec.get("enlace")}
+
+
+class DetailScraper:
+    def __init__(self, input_file, block="medios", mode="http", workers=8, per_host=4,
+                 delay=0.3, retries=3, headless=False, previous=None, max_age_days=30):
+        if mode not in MODES:
+            raise ValueError(f"Modo no soportado: {mode} (use {', '.join(MODES)})")
+        with open(input_file, "r", encoding="utf-8") as f:
+            self.data = json.load(f)
+
+        self.input_file = input_file
+        self.results = []
+        self.mode = mode
+        self.workers = max(1, int(workers))
+        self.delay = delay
+        self.timeout = (10, 25)
+        self.headless = headless
+        # Solo se lee el DOM: imágenes/fuentes/video/trackers no se descargan
+        self.blocker = ResourceBlocker(block)
+        self.ready = ReadyWaiter()
+        self.driver = None  # Chrome se abre solo si hace falta (modo selenium o respaldo)
+        self.session = get_session(pool_size=self.workers, retries=retries, headers=HEADERS) if mode == "http" else None
+        self.limiter = HostLimiter(per_host)
+        self.latencias = []  # {"url", "via", "estado", "segundos"}
+        self.fetch_stats = {"http": 0, "navegador": 0, "respaldo": 0, "fallas_http": 0,
+                            "sin_contenido": 0, "errores": 0}
+        self._lock = threading.Lock()
+        # Modo incremental: salida anterior por enlace (None = se visitan todas las fichas)
+        self.previous = load_previous(previous) if previous else None
+        self.max_age_days = float(max_age_days)
+        self.incremental_stats = {"reutilizadas": 0, "nuevas": 0, "vencidas": 0, "con_error": 0}
+
+    def setup_driver(self):
+        options = Options()
+        if self.headless:
+            options.add_argument("--headless")
+        self.blocker.configure(options)
+        self.driver = webdriver.Chrome(options=options)
+        self.blocker.attach(self.driver)
+
+    def _count(self, key):
+        with self._lock:
+            self.fetch_stats[key] += 1
+
+    def _record(self, url, via, estado, t0):
+        reg = {"url": url, "via": via, "estado": estado, "segundos": round(time.perf_counter() - t0, 3)}
+        with self._lock:
+            self.latencias.append(reg)
+        return reg
+
+    def fetch_http(self, url):
+        """Ficha por HTTP; devuelve el soup o None si hay que abrirla en Chrome"""
+        with self.limiter.slot(url):
+            t0 = time.perf_counter()  # sin contar la espera por el cupo del host
+            try:
+                r = self.session.get(url, timeout=self.timeout)
+            except requests.RequestException as e:
+                self._record(url, "http", type(e).__name__, t0)
+                self._count("fallas_http")
+                return None
+            else:
+                reg = self._record(url, "http", r.status_code, t0)
+            finally:
+                time.sleep(self.delay * random.uniform(1, 2))  # cortesía dentro del cupo del host
+        if r.status_code >= 400:
+            self._count("fallas_http")
+            return None
+        # colombia.travel sirve UTF-8; requests asume latin-1 si falta el charset
+        encoding = r.encoding if r.encoding and r.encoding.lower() != "iso-8859-1" else "utf-8"
+        soup = make_soup(r.content.decode(encoding, "replace"))
+        if not has_content(soup):
+            reg["estado"] = "sin_contenido"
+            self._count("sin_contenido")
+            return None
+        self._count("http")
+        print(f"🔎 HTTP {url} ({reg['segundos']:.2f} s)")
+        return soup
+
+    def fetch_browser(self, url):
+        """Ficha con Chrome (modo selenium o respaldo); devuelve el soup"""
+        if self.driver is None:
+            self.setup_driver()
+        print(f"🔎 Visitando: {url}")
+        t0 = time.perf_counter()
+        try:
+            reg = self.ready.load(self.driver, url, "body", by=By.TAG_NAME, selector_timeout=10)
+        except Exception as e:
+            self._record(url, "navegador", type(e).__name__, t0)
+            raise
+        self._count("navegador")
+        print(f"   ⏱️ {ReadyWaiter.describe(reg)}")
+        stats = self.blocker.page_stats(self.driver)
+        if stats["bloqueadas"]:
+            print(f"   🧱 {ResourceBlocker.describe(stats)}")
+        self._record(url, "navegador", "ok", t0)
+        return make_soup(self.driver.page_source)
+
+    def scrape_detail(self, entry, soup=None):
+        """Enriquecer una entrada; si no se pasa el soup, la ficha se abre en Chrome"""
+        url = entry.get("enlace")
+        if not url:
+            print(f"⚠️ No hay enlace para {entry.get('titulo')}")
+            entry["error"] = "Sin enlace"
+            return entry
+
+        try:
+            if soup is None:
+                soup = self.fetch_browser(url)
+
+            entry.update(extract_detail(soup, entry))
+            entry["fecha_detalle"] = datetime.now().isoformat()
+            entry.pop("error", None)
+
+            return entry
+
+        except Exception as e:
+            print(f"❌ Error al scrapear {url}: {e}")
+            self._count("errores")
+            entry["error"] = str(e)
+            return entry
+
+    def reusable(self, entry):
+        """Registro anterior de la entrada si está fresco (< max_age_days y sin error); si no, None"""
+        prev = self.previous.get(entry.get("enlace")) if entry.get("enlace") else None
+        if prev is None:
+            self.incremental_stats["nuevas"] += 1
+            return None
+        if prev.get("error"):
+            self.incremental_stats["con_error"] += 1
+            return None
+        try:
+            fecha = datetime.fromisoformat(prev["fecha_detalle"])
+        except (KeyError, TypeError, ValueError):
+            fecha = None
+        if fecha is None or (datetime.now() - fecha).total_seconds() > self.max_age_days * 86400:
+            self.incremental_stats["vencidas"] += 1
+            return None
+        self.incremental_stats["reutilizadas"] += 1
+        return prev
+
+    def _scrape_http(self, entry):
+        # En un hilo del pool: (entrada, necesita Chrome)
+        if not entry.get("enlace"):
+            return self.scrape_detail(entry), False
+        soup = self.fetch_http(entry["enlace"])
+        if soup is None:
+            return entry, True
+        return self.scrape_detail(entry, soup), False
+
+    def run(self):
+        # Orden de salida = orden de la entrada; scrape_detail completa cada entrada en su lugar
+        ordered, todo = [], []
+        for entry in self.data:
+            prev = self.reusable(entry) if self.previous is not None else None
+            if prev is None:
+                todo.append(entry)
+            ordered.append(prev or entry)
+        if self.previous is not None:
+            st = self.incremental_stats
+            print(f"♻️ Incremental: {st['reutilizadas']} fichas reutilizadas; se visitan {len(todo)} "
+                  f"({st['nuevas']} nuevas, {st['vencidas']} de más de {self.max_age_days:g} días, "
+                  f"{st['con_error']} con error)")
+
+        try:
+            if self.mode == "http":
+                with ThreadPoolExecutor(max_workers=self.workers) as pool:
+                    done = list(pool.map(self._scrape_http, todo))
+                respaldo = [entry for entry, needs_browser in done if needs_browser]
+                if respaldo:
+                    print(f"🧭 {len(respaldo)} fichas sin contenido por HTTP; se abren en Chrome")
+                for entry in respaldo:
+                    self._count("respaldo")
+                    self.scrape_detail(entry)
+            else:
+                for entry in todo:
+                    self.scrape_detail(entry)
+        finally:
+            self.close()
+        self.results.extend(ordered)
+
+        bloqueo = self.blocker.summary()
+        if bloqueo:
+            print(f"🧱 {bloqueo}")
+        latencia = self.latency_summary()
+        if latencia:
+            print(f"⏱️ {latencia}")
+
+    def latency_summary(self, slowest=3):
+        """Promedio/p90 por vía, conteo de fallas y las URLs más lentas"""
+        if not self.latencias:
+            return None
+        partes = []
+        for via in sorted({r["via"] for r in self.latencias}):
+            segs = sorted(r["segundos"] for r in self.latencias if r["via"] == via)
+            p90 = segs[min(len(segs) - 1, int(len(segs) * 0.9))]
+            partes.append(f"{via}: {len(segs)} solicitudes, promedio {sum(segs) / len(segs):.2f} s, p90 {p90:.2f} s")
+        st = self.fetch_stats
+        partes.append(f"fallas HTTP {st['fallas_http']}, sin contenido {st['sin_contenido']}, "
+                      f"respaldo en Chrome {st['respaldo']}, errores {st['errores']}")
+        lentas = sorted(self.latencias, key=lambda r: -r["segundos"])[:slowest]
+        partes.append("más lentas: " + "; ".join(f"{r['url']} {r['segundos']:.1f} s" for r in lentas))
+        return "Fichas — " + " | ".join(partes)
+
+    def close(self):
+        if self.driver:
+            self.driver.quit()
+            self.driver = None
+        if self.session is not None:
+            self.session.close()
+
+    def save_results(self, output_json=None, output_csv=None):
+        prefix = output_prefix(self.input_file)
+        output_json = output_json or f"{prefix}.json"
+        output_csv = output_csv or f"{prefix}.csv"
+
+        # Guardar JSON
+        with open(output_json, "w", encoding="utf-8") as f:
+            json.dump(self.results, f, ensure_ascii=False, indent=2)
+
+        # Guardar CSV
+        if self.results:
+            keys = sorted(set().union(*(d.keys() for d in self.results)))
+            with open(output_csv, "w", newline="", encoding="utf-8") as f:
+                writer = csv.DictWriter(f, fieldnames=keys)
+                writer.writeheader()
+                writer.writerows(self.results)
+
+        print(f"✅ Resultados guardados en {output_json} y {output_csv}")
+
+        # Latencia por URL
+        if self.latencias:
+            latencias_csv = f"{os.path.splitext(output_csv)[0]}_latencias.csv"
+            with open(latencias_csv, "w", newline="", encoding="utf-8") as f:
+                writer = csv.DictWriter(f, fieldnames=["url", "via", "estado", "segundos"])
+                writer.writeheader()
+                writer.writerows(self.latencias)
+            print(f"✅ Latencias por URL en {latencias_csv}")
+
+
+def build_parser(description, input_file=None):
+    ap = argparse.ArgumentParser(description=description)
+    if input_file:
+        ap.add_argument("input", nargs="?", default=input_file, help="JSON de entrada del scraper del departamento.")
+    else:
+        ap.add_argument("input", help="JSON de entrada (turismo_<depto>_completo_<ts>.json).")
+    ap.add_argument("--mode", choices=MODES, default="http",
+                    help="'http' (pool HTTP, Chrome solo como respaldo) o 'selenium' (todo con Chrome).")
+    ap.add_argument("--workers", type=int, default=8, help="Fichas descargadas a la vez en modo http.")
+    ap.add_argument("--per-host", type=int, default=4, help="Máximo de descargas simultáneas por host.")
+    ap.add_argument("--delay", type=float, default=0.3,
+                    help="Pausa base de cortesía por descarga HTTP, en segundos (se aplica con jitter x1-x2).")
+    ap.add_argument("--headless", action="store_true", help="Ejecutar Chrome en modo headless.")
+    ap.add_argument("--parser", choices=PARSERS, default=get_parser(),
+                    help="Motor HTML de BeautifulSoup (lxml es más rápido; ver bench_parsers.py).")
+    ap.add_argument("--block", choices=PERFILES, default="medios",
+                    help="Recursos que Chrome no descarga: 'medios' (imágenes, fuentes, video, trackers), "
+                         "'agresivo' (además CSS) o 'ninguno'.")
+    ap.add_argument("--incremental", action="store_true",
+                    help="Reutiliza las fichas frescas de la salida anterior y solo visita enlaces nuevos, vencidos o con error.")
+    ap.add_argument("--previous", default=None,
+                    help="Salida anterior para --incremental (por defecto <prefijo>_detalles.json aquí o en Resultados/).")
+    ap.add_argument("--max-age-days", type=float, default=30,
+                    help="En modo incremental, antigüedad máxima (según fecha_detalle) para reutilizar una ficha.")
+    return ap
+
+def main_detalle(input_file=None):
+    """CLI común (Scdetallado<depto>.py pasa su JSON de entrada por defecto)"""
+    args = build_parser("Enriquece las fichas de colombia.travel de un departamento.", input_file).parse_args()
+    set_parser(args.parser)
+    previous = None
+    if args.incremental:
+        previous = args.previous or previous_output(args.input)
+        if previous is None:
+            print("ℹ️ No hay salida anterior de detalles; se visitan todas las fichas")
+        else:
+            print(f"♻️ Salida anterior: {previous}")
+    scraper = DetailScraper(input_file=args.input, block=args.block, mode=args.mode, workers=args.workers,
+                            per_host=args.per_host, delay=args.delay, headless=args.headless,
+                            previous=previous, max_age_days=args.max_age_days)
+    scraper.run()
+    scraper.save_results()
+
+
+if __name__ == "__main__":
+    main_detalle()
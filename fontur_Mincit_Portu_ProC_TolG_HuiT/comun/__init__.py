@@ -0,0 +1,7 @@
+# -*- coding: utf-8 -*-
+"""
+Módulos compartidos por los scrapers de Fontur/, ProColombia/ y Mincit/ (Chrome/Selenium,
+descarga por HTTP).
+Cada carpeta se sigue ejecutando por separado; los scripts agregan la carpeta raíz a sys.path
+antes de importar desde aquí.
+"""
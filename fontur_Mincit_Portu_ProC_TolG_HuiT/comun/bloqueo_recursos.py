@@ -0,0 +1,119 @@
+# -*- coding: utf-8 -*-
+"""
+Bloqueo de recursos para los scrapers con Chrome/Selenium.
+- Solo se lee el DOM: imágenes, fuentes, video/audio y analítica de terceros no hacen falta
+- Perfiles: "ninguno", "medios" (imágenes, fuentes, video/audio, trackers) y
+  "agresivo" (además hojas de estilo; puede romper clics que dependen de la maquetación)
+- El bloqueo se hace con Network.setBlockedURLs (DevTools) y los contadores salen del
+  log de rendimiento de Chrome: solicitudes bloqueadas por tipo y bytes transferidos por página
+  (de lo bloqueado Chrome no conoce el tamaño: nunca llega a pedirlo)
+
+Compartido por Fontur/, ProColombia/ y Mincit/ (from comun.bloqueo_recursos import ...).
+"""
+
+import json
+
+PERFILES = ("ninguno", "medios", "agresivo")
+
+# Patrones de URL (comodín *) por tipo de recurso
+PATRONES = {
+    "imagen": ["*.jpg", "*.jpg?*", "*.jpeg", "*.jpeg?*", "*.png", "*.png?*", "*.gif", "*.gif?*",
+               "*.webp", "*.webp?*", "*.avif", "*.avif?*", "*.svg", "*.svg?*", "*.ico", "*.ico?*"],
+    "fuente": ["*.woff", "*.woff?*", "*.woff2", "*.woff2?*", "*.ttf", "*.ttf?*", "*.otf", "*.otf?*",
+               "*.eot", "*.eot?*"],
+    "media": ["*.mp4", "*.mp4?*", "*.webm", "*.webm?*", "*.m3u8*", "*.mp3", "*.mp3?*", "*.ogg", "*.ogg?*"],
+    "estilo": ["*.css", "*.css?*"],
+}
+
+# Hosts de analítica/publicidad/widgets que no aportan contenido
+TRACKERS = [
+    "google-analytics.com", "googletagmanager.com", "doubleclick.net", "googlesyndication.com",
+    "googleadservices.com", "facebook.net", "connect.facebook.net", "hotjar.com", "clarity.ms",
+    "analytics.tiktok.com", "snap.licdn.com", "static.ads-twitter.com", "platform.twitter.com",
+    "youtube.com/embed", "ytimg.com", "cdn.onesignal.com", "tawk.to", "addthis.com",
+]
+
+TIPOS_POR_PERFIL = {
+    "ninguno": (),
+    "medios": ("imagen", "fuente", "media"),
+    "agresivo": ("imagen", "fuente", "media", "estilo"),
+}
+
+class ResourceBlocker:
+    """
+    Uso:
+        blocker = ResourceBlocker("medios")
+        blocker.configure(chrome_options)      # antes de webdriver.Chrome(...)
+        driver = webdriver.Chrome(options=chrome_options)
+        blocker.attach(driver)
+        driver.get(url); stats = blocker.page_stats(driver)
+    """
+    def __init__(self, profile="medios", extra_hosts=()):
+        if profile not in PERFILES:
+            raise ValueError(f"Perfil de bloqueo no soportado: {profile} (use {', '.join(PERFILES)})")
+        self.profile = profile
+        self.patterns = [p for tipo in TIPOS_POR_PERFIL[profile] for p in PATRONES[tipo]]
+        if profile != "ninguno":
+            self.patterns += [f"*{host}*" for host in [*TRACKERS, *extra_hosts]]
+        self.enabled = bool(self.patterns)
+        self.totals = {"paginas": 0, "bloqueadas": 0, "bytes_transferidos": 0}
+
+    def configure(self, options):
+        if self.enabled:
+            # Habilita el log de rendimiento (eventos Network.*) para los contadores
+            options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+        return options
+
+    def attach(self, driver):
+        if not self.enabled:
+            return
+        try:
+            driver.execute_cdp_cmd("Network.enable", {})
+            driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": self.patterns})
+        except Exception as e:
+            # Sin DevTools (otro navegador/driver remoto) se sigue sin bloqueo
+            print(f"[WARN] No se pudo activar el bloqueo de recursos: {e}")
+            self.enabled = False
+
+    def page_stats(self, driver):
+        """
+        Vacía el log de rendimiento y devuelve lo ocurrido desde la llamada anterior:
+        {"bloqueadas": n, "por_tipo": {tipo: n}, "bytes_transferidos": n}
+        """
+        stats = {"bloqueadas": 0, "por_tipo": {}, "bytes_transferidos": 0}
+        if not self.enabled:
+            return stats
+        try:
+            entries = driver.get_log("performance")
+        except Exception:
+            return stats
+        for entry in entries:
+            try:
+                msg = json.loads(entry["message"])["message"]
+            except (KeyError, ValueError):
+                continue
+            method, params = msg.get("method"), msg.get("params", {})
+            if method == "Network.loadingFailed" and params.get("blockedReason"):
+                tipo = params.get("type", "Other")
+                stats["bloqueadas"] += 1
+                stats["por_tipo"][tipo] = stats["por_tipo"].get(tipo, 0) + 1
+            elif method == "Network.loadingFinished":
+                stats["bytes_transferidos"] += int(params.get("encodedDataLength") or 0)
+        self.totals["paginas"] += 1
+        self.totals["bloqueadas"] += stats["bloqueadas"]
+        self.totals["bytes_transferidos"] += stats["bytes_transferidos"]
+        return stats
+
+    @staticmethod
+    def describe(stats):
+        tipos = ", ".join(f"{t} {n}" for t, n in sorted(stats["por_tipo"].items(), key=lambda kv: -kv[1]))
+        return (f"{stats['bloqueadas']} recursos bloqueados" + (f" ({tipos})" if tipos else "")
+                + f", {stats['bytes_transferidos'] / 1024:.0f} KB transferidos")
+
+    def summary(self):
+        t = self.totals
+        if not t["paginas"]:
+            return None
+        return (f"Bloqueo '{self.profile}': {t['bloqueadas']} recursos bloqueados en {t['paginas']} páginas "
+                f"({t['bloqueadas'] / t['paginas']:.1f}/página), {t['bytes_transferidos'] / 1024:.0f} KB transferidos "
+                f"({t['bytes_transferidos'] / 1024 / t['paginas']:.0f} KB/página)")
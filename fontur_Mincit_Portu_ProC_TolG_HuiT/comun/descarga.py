@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+"""
+Descarga por HTTP compartida por Fontur/ y ProColombia/
+- get_session: requests.Session con pool keep-alive y reintentos/backoff (429/5xx)
+- HostLimiter: tope de descargas simultáneas por host, seguro entre hilos
+- extract_last_page: última página del paginador de Drupal (?page=N), para repartir
+  la descarga de los listados sin abrir una página tras otra
+
+from comun.descarga import HostLimiter, get_session, extract_last_page
+"""
+
+import threading
+from urllib.parse import urlparse, parse_qs
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+USER_AGENT = ("Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+              "AppleWebKit/537.36 (KHTML, like Gecko) "
+              "Chrome/124.0.0.0 Safari/537.36")
+
+HEADERS = {
+    "User-Agent": USER_AGENT,
+    "Accept-Language": "es-ES,es;q=0.9,en;q=0.8",
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+}
+
+def get_session(pool_size=8, retries=3, headers=None):
+    """Sesión con pool_size conexiones por host; headers reemplaza a HEADERS si se indica."""
+    s = requests.Session()
+    retry = Retry(
+        total=retries,
+        backoff_factor=0.6,
+        status_forcelist=[429, 500, 502, 503, 504],
+        allowed_methods=["GET", "HEAD"],
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(max_retries=retry, pool_connections=pool_size, pool_maxsize=pool_size)
+    s.mount("http://", adapter)
+    s.mount("https://", adapter)
+    s.headers.update(headers or HEADERS)
+    return s
+
+# -------------------------
+# Cortesía por host
+# -------------------------
+class HostLimiter:
+    def __init__(self, per_host=4):
+        self.per_host = max(1, int(per_host))
+        self._sems = {}
+        self._lock = threading.Lock()
+
+    def _sem(self, url):
+        host = urlparse(url).netloc
+        with self._lock:
+            sem = self._sems.get(host)
+            if sem is None:
+                sem = self._sems[host] = threading.BoundedSemaphore(self.per_host)
+            return sem
+
+    def slot(self, url):
+        """Uso: with limiter.slot(url): ..."""
+        return self._sem(url)
+
+def extract_last_page(soup):
+    """
+    Última página (índice ?page=N, base 0) según el paginador de Drupal; None si la
+    página no trae paginador. Acepta también el formato de Drupal 7 (page=0,N).
+    """
+    pager = soup.select_one("nav.pager, .pager, ul.pager__items, ul.pager, .item-list .pager")
+    if pager is None:
+        return None
+    pages = [0]
+    for a in pager.select("a[href]"):
+        vals = parse_qs(urlparse(a.get("href")).query).get("page")
+        if not vals:
+            continue
+        try:
+            pages.append(int(vals[0].split(",")[-1]))
+        except ValueError:
+            continue
+    return max(pages)
@@ -0,0 +1,190 @@
+# -*- coding: utf-8 -*-
+"""
+Espera de página "lista" para los scrapers con Chrome/Selenium, en lugar de pausas fijas.
+- load(driver, url, selector): driver.get + espera del selector + ventana de calma del DOM
+- settle(driver, url, tipo): solo la ventana de calma (después de un clic)
+- scroll(driver, url): scroll al final + calma + que la página haya crecido (scroll infinito)
+- Calma = sin nodos/texto nuevos en el DOM (MutationObserver), sin recursos de red nuevos
+  (performance.getEntriesByType("resource")) y sin solicitudes fetch/XHR en curso durante
+  quiet_ms; con tope duro timeout. Los recursos solo aparecen en performance al terminar,
+  por eso las solicitudes pendientes se cuentan envolviendo fetch y XMLHttpRequest.send
+  (script inyectado al inicio de cada documento vía DevTools y, si no hay DevTools, al esperar)
+- Los cambios de atributos no cuentan: carruseles y animaciones los tocan sin parar
+- scroll() vuelve apenas hay calma e informa si cambió scrollHeight o la cantidad de elementos
+  ("crecio"), para que quien llama decida si sigue bajando; la pausa fija de antes solo se
+  aplica cuando no se llegó a la calma (tope o script fallido)
+- Cada espera queda registrada (URL, tipo, segundos, si llegó a la calma o al tope) y
+  summary() resume dónde se va el tiempo: promedio, p90 y las URLs más lentas
+
+Compartido por Fontur/, ProColombia/ y Mincit/ (from comun.espera_carga import ReadyWaiter).
+"""
+
+import time
+import random
+
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+
+# Contador de solicitudes fetch/XHR en curso (window.__esperaPendientes.n); se instala una vez por documento
+_HOOK_JS = """
+(function () {
+    if (window.__esperaPendientes) return;
+    const p = window.__esperaPendientes = {n: 0};
+    const fin = () => { p.n = Math.max(0, p.n - 1); };
+    if (window.fetch) {
+        const fetchOriginal = window.fetch;
+        window.fetch = function () {
+            p.n++;
+            try {
+                return fetchOriginal.apply(this, arguments).finally(fin);
+            } catch (e) { fin(); throw e; }
+        };
+    }
+    if (window.XMLHttpRequest) {
+        const sendOriginal = XMLHttpRequest.prototype.send;
+        XMLHttpRequest.prototype.send = function () {
+            p.n++;
+            this.addEventListener("loadend", fin, {once: true});
+            try {
+                return sendOriginal.apply(this, arguments);
+            } catch (e) { fin(); throw e; }
+        };
+    }
+})();
+"""
+
+# Tamaño de la página para saber si un scroll trajo contenido nuevo
+_SIZE_JS = """
+return {alto: document.body ? document.body.scrollHeight : 0,
+        nodos: document.getElementsByTagName("*").length};
+"""
+
+# Script asíncrono: resuelve cuando el DOM y la red llevan `quiet` ms sin actividad, sin
+# solicitudes pendientes (y el documento terminó de parsearse) o al llegar a `limit` ms.
+# Con `antes` (tamaño previo al scroll) informa además si la página creció
+_QUIET_JS = """
+const [quiet, limit, antes, done] = arguments;
+const t0 = performance.now();
+let last = t0, mutaciones = 0;
+let recursos = performance.getEntriesByType("resource").length;
+const obs = new MutationObserver(() => { last = performance.now(); mutaciones++; });
+obs.observe(document.documentElement || document,
+            {childList: true, subtree: true, characterData: true});
+(function check() {
+    const now = performance.now();
+    const n = performance.getEntriesByType("resource").length;
+    if (n !== recursos) { recursos = n; last = now; }
+    const pendientes = window.__esperaPendientes ? window.__esperaPendientes.n : 0;
+    if (pendientes > 0) { last = now; }
+    const calma = now - last >= quiet && document.readyState !== "loading";
+    if (calma || now - t0 >= limit) {
+        obs.disconnect();
+        const crecio = !antes || (document.body ? document.body.scrollHeight : 0) !== antes.alto
+                       || document.getElementsByTagName("*").length !== antes.nodos;
+        done({calma: calma, crecio: crecio, mutaciones: mutaciones, pendientes: pendientes});
+    } else {
+        setTimeout(check, 50);
+    }
+})();
+"""
+
+class ReadyWaiter:
+    """
+    Uso:
+        ready = ReadyWaiter(quiet_ms=500, timeout=10)
+        ready.load(driver, url, "div.search-result")   # lanza TimeoutException si no aparece
+        reg = ready.scroll(driver, url, timeout=4)     # scroll infinito
+        if reg["crecio"] is False: ...                 # la página no trajo más: dejar de bajar
+        print(ready.summary())
+    """
+    def __init__(self, quiet_ms=500, timeout=10, selector_timeout=25):
+        self.quiet_ms = int(quiet_ms)
+        self.timeout = float(timeout)
+        self.selector_timeout = float(selector_timeout)
+        self.registros = []  # {"url", "tipo", "segundos", "calma"[, "crecio"]}
+        self._hooked = set()  # sesiones con el contador inyectado al inicio de cada documento
+
+    def _hook(self, driver):
+        # Con DevTools el contador queda activo desde el primer script de cada página;
+        # sin DevTools se inyecta en el documento actual (solo ve lo que empiece después)
+        session = getattr(driver, "session_id", None)
+        if session not in self._hooked:
+            self._hooked.add(session)
+            try:
+                driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {"source": _HOOK_JS})
+            except Exception:
+                pass
+        try:
+            driver.execute_script(_HOOK_JS)
+        except Exception:
+            pass
+
+    def _quiet(self, driver, timeout=None, antes=None):
+        # {"calma": bool, "crecio": bool}; calma False si se llegó al tope (o el script falló)
+        timeout = timeout or self.timeout
+        try:
+            driver.set_script_timeout(timeout + 5)
+            res = driver.execute_async_script(_QUIET_JS, self.quiet_ms, int(timeout * 1000), antes)
+            return res or {}
+        except Exception:
+            return {}
+
+    def _record(self, url, tipo, t0, calma, **extra):
+        reg = {"url": url, "tipo": tipo, "segundos": round(time.perf_counter() - t0, 3), "calma": calma, **extra}
+        self.registros.append(reg)
+        return reg
+
+    def load(self, driver, url, selector="body", by=By.CSS_SELECTOR, selector_timeout=None):
+        """Navega y espera el selector y la calma; devuelve el registro de la espera."""
+        t0 = time.perf_counter()
+        self._hook(driver)
+        driver.get(url)
+        WebDriverWait(driver, selector_timeout or self.selector_timeout).until(
+            EC.presence_of_element_located((by, selector)))
+        self._hook(driver)
+        return self._record(url, "carga", t0, bool(self._quiet(driver).get("calma")))
+
+    def settle(self, driver, url, tipo="clic", timeout=None):
+        """Espera la calma tras una acción en la página ya abierta (clic, envío de formulario)."""
+        t0 = time.perf_counter()
+        return self._record(url, tipo, t0, bool(self._quiet(driver, timeout).get("calma")))
+
+    def scroll(self, driver, url, timeout=None, espera_fija=(2, 4)):
+        """
+        Scroll al final y espera la calma (sin solicitudes pendientes). El registro trae
+        "crecio": True/False si cambió o no scrollHeight o la cantidad de elementos (None si no
+        se pudo medir). Sin calma se aplica la pausa fija de antes (segundos o rango (min, max)).
+        """
+        t0 = time.perf_counter()
+        self._hook(driver)
+        try:
+            antes = driver.execute_script(_SIZE_JS)
+        except Exception:
+            antes = None
+        driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
+        res = self._quiet(driver, timeout, antes) if antes else {}
+        calma = bool(res.get("calma"))
+        if not calma:
+            time.sleep(random.uniform(*espera_fija) if isinstance(espera_fija, tuple) else espera_fija)
+        return self._record(url, "scroll", t0, calma, crecio=res.get("crecio"))
+
+    @staticmethod
+    def describe(reg):
+        return f"lista en {reg['segundos']:.2f} s" + ("" if reg["calma"] else " (tope)")
+
+    def summary(self, slowest=3):
+        if not self.registros:
+            return None
+        partes = []
+        for tipo in sorted({r["tipo"] for r in self.registros}):
+            segs = sorted(r["segundos"] for r in self.registros if r["tipo"] == tipo)
+            topes = sum(1 for r in self.registros if r["tipo"] == tipo and not r["calma"])
+            sin_cambio = sum(1 for r in self.registros if r["tipo"] == tipo and r.get("crecio") is False)
+            p90 = segs[min(len(segs) - 1, int(len(segs) * 0.9))]
+            partes.append(f"{tipo}: {len(segs)} esperas, promedio {sum(segs) / len(segs):.2f} s, "
+                          f"p90 {p90:.2f} s, total {sum(segs):.0f} s" + (f", {topes} al tope" if topes else "")
+                          + (f", {sin_cambio} sin cambio" if sin_cambio else ""))
+        lentas = sorted(self.registros, key=lambda r: -r["segundos"])[:slowest]
+        partes.append("más lentas: " + "; ".join(f"{r['url']} {r['segundos']:.1f} s" for r in lentas))
+        return "Espera de carga — " + " | ".join(partes)
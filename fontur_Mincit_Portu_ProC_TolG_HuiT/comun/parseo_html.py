@@ -0,0 +1,49 @@
+# -*- coding: utf-8 -*-
+"""
+Construcción del árbol HTML común a los scrapers.
+- make_soup(html): BeautifulSoup con el motor elegido; el código de extracción y los
+  selectores CSS (soupsieve) no cambian al cambiar de motor
+- Motores: "html.parser" (librería estándar, por defecto), "lxml" (en C, varias veces más
+  rápido al parsear) y "html5lib" (el más tolerante y el más lento)
+- Elección: set_parser(nombre) (--parser en los CLI) o la variable de entorno SCRAPER_PARSER
+- Si el motor pedido no está instalado se avisa y se sigue con html.parser
+- bench_parsers.py compara tiempo y campos extraídos por motor antes de cambiar el predeterminado
+
+Compartido por Fontur/ y ProColombia/ (from comun.parseo_html import make_soup).
+"""
+
+import os
+
+from bs4 import BeautifulSoup, FeatureNotFound
+
+PARSERS = ("html.parser", "lxml", "html5lib")
+DEFAULT_PARSER = "html.parser"
+
+_parser = DEFAULT_PARSER
+
+def available(name):
+    try:
+        BeautifulSoup("", name)
+        return True
+    except FeatureNotFound:
+        return False
+
+def set_parser(name):
+    """Fija el motor para todas las llamadas a make_soup; devuelve el que quedó activo."""
+    global _parser
+    if name not in PARSERS:
+        raise ValueError(f"Parser no soportado: {name} (use {', '.join(PARSERS)})")
+    if not available(name):
+        print(f"[WARN] El parser '{name}' no está instalado (pip install {name}); se usa {DEFAULT_PARSER}")
+        name = DEFAULT_PARSER
+    _parser = name
+    return _parser
+
+def get_parser():
+    return _parser
+
+def make_soup(html, parser=None):
+    return BeautifulSoup(html or "", parser or _parser)
+
+if os.environ.get("SCRAPER_PARSER"):
+    set_parser(os.environ["SCRAPER_PARSER"])